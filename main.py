@@ -6,4 +6,5 @@ from riskradar.api.main import app
 
 if __name__ == "__main__":
     import uvicorn
+    # Development server; loop/http "auto" use uvloop and httptools when installed
     uvicorn.run(app, host="0.0.0.0", port=8000, reload=True)
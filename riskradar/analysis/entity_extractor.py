@@ -2,37 +2,276 @@
 Entity extraction module for identifying key entities in threat content.
 """
 
-from typing import Dict, List, Any
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from pathlib import Path
+from typing import Dict, List, Any, Optional, Set, Tuple
+import hashlib
+import os
 import re
 import logging
 
+from .keyword_matcher import KeywordMatcher
+
+# Optional multi-pattern engines; extraction falls back to stdlib re alone
+try:
+    import hyperscan
+except ImportError:
+    hyperscan = None
+
+try:
+    import re2
+except ImportError:
+    re2 = None
+
 logger = logging.getLogger(__name__)
 
 
+def _hyperscan_cache_path(expressions: List[bytes], flags: List[int]) -> Path:
+    """Cache file for a compiled database, keyed by its inputs and the Hyperscan version."""
+    digest = hashlib.sha256(
+        repr((hyperscan.__version__, expressions, flags)).encode()
+    ).hexdigest()
+    cache_home = os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache')
+    return Path(cache_home) / 'riskradar' / f'{digest}.hsdb'
+
+
+def _load_hyperscan_database(path: Path):
+    """Load a serialized Hyperscan database, or return None if it is missing or unusable."""
+    try:
+        db = hyperscan.loadb(path.read_bytes(), hyperscan.HS_MODE_BLOCK)
+        db.scratch = hyperscan.Scratch(db)
+        return db
+    except FileNotFoundError:
+        return None
+    except Exception as e:
+        # Corrupt file or one built for another CPU/version; it gets rebuilt
+        logger.debug(f"Ignoring cached Hyperscan database {path}: {e}")
+        return None
+
+
+def _save_hyperscan_database(path: Path, db) -> None:
+    """Serialize a compiled Hyperscan database for later processes."""
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(f'{path.name}.{os.getpid()}.tmp')
+        tmp_path.write_bytes(hyperscan.dumpb(db))
+        # Atomic rename so concurrent processes never read a partial file
+        os.replace(tmp_path, path)
+    except Exception as e:
+        logger.debug(f"Could not cache Hyperscan database at {path}: {e}")
+
+
+class PatternPrefilter:
+    """
+    Single-pass scan reporting which patterns can possibly match a text.
+    
+    All patterns are compiled into one Hyperscan database (or an RE2 set
+    when Hyperscan is unavailable), so the text is walked once regardless
+    of how many patterns are registered. Exact matches are still taken
+    from the stdlib ``re`` objects; the prefilter only lets callers skip
+    patterns that cannot match.
+    """
+    
+    def __init__(self, entries: List[Tuple[str, str, int]]):
+        """
+        Build the prefilter.
+        
+        Args:
+            entries: (key, pattern, re flags) triples; several entries may
+                share a key
+        """
+        self.backend = None
+        self._keys = [key for key, _, _ in entries]
+        # Keys whose pattern the backend rejected are always reported
+        self._always: Set[str] = set()
+        self._db = None
+        
+        if hyperscan is not None:
+            self._build_hyperscan(entries)
+        elif re2 is not None:
+            self._build_re2(entries)
+    
+    def _build_hyperscan(self, entries: List[Tuple[str, str, int]]):
+        """Load the Hyperscan block-mode database from disk, or compile and save it."""
+        base_flags = hyperscan.HS_FLAG_SINGLEMATCH | hyperscan.HS_FLAG_PREFILTER
+        expressions = [pattern.encode() for _, pattern, _ in entries]
+        flags = [
+            base_flags | (hyperscan.HS_FLAG_CASELESS if flags & re.IGNORECASE else 0)
+            for _, _, flags in entries
+        ]
+        cache_path = _hyperscan_cache_path(expressions, flags)
+        
+        self._db = _load_hyperscan_database(cache_path)
+        if self._db is not None:
+            self.backend = 'hyperscan'
+            return
+        
+        try:
+            self._db = hyperscan.Database()
+            self._db.compile(
+                expressions=expressions,
+                ids=list(range(len(entries))),
+                elements=len(entries),
+                flags=flags
+            )
+            self.backend = 'hyperscan'
+        except Exception as e:
+            logger.warning(f"Hyperscan prefilter unavailable: {e}")
+            self._db = None
+            return
+        
+        _save_hyperscan_database(cache_path, self._db)
+    
+    def _build_re2(self, entries: List[Tuple[str, str, int]]):
+        """Compile the entries into an unanchored RE2 set."""
+        try:
+            self._db = re2.Set.SearchSet()
+            # RE2 set indices follow insertion order, which may skip rejected entries
+            self._re2_keys = []
+            for key, pattern, flags in entries:
+                try:
+                    self._db.Add(('(?i)' if flags & re.IGNORECASE else '') + pattern)
+                    self._re2_keys.append(key)
+                except re2.error:
+                    self._always.add(key)
+            self._db.Compile()
+            self.backend = 're2'
+        except Exception as e:
+            logger.warning(f"RE2 prefilter unavailable: {e}")
+            self._db = None
+    
+    def candidates(self, text: str) -> Optional[Set[str]]:
+        """
+        Get the keys whose patterns may match the text.
+        
+        Args:
+            text: Text content to scan
+            
+        Returns:
+            Set of candidate keys, or None when no backend is available and
+            every pattern has to be tried
+        """
+        if self._db is None:
+            return None
+        
+        data = text.encode('utf-8', 'replace')
+        if self.backend == 'hyperscan':
+            found = set()
+            
+            def on_match(match_id, start, end, flags, context):
+                context.add(match_id)
+            
+            self._db.scan(data, match_event_handler=on_match, context=found)
+            keys = {self._keys[match_id] for match_id in found}
+        else:
+            keys = {self._re2_keys[index] for index in self._db.Match(data) or ()}
+        
+        return keys | self._always if self._always else keys
+
+
+# Predefined patterns for common entity types. Domains and emails only start
+# where the preceding character could not extend the match, so a long dotted
+# or hyphenated run is scanned once rather than from every word boundary in it.
+ENTITY_PATTERNS = {
+    'ip_addresses': r'\b(?:[0-9]{1,3}\.){3}[0-9]{1,3}\b',
+    'domains': r'(?<![A-Za-z0-9.-])\b[a-zA-Z0-9](?:[a-zA-Z0-9\-]{0,61}[a-zA-Z0-9])?(?:\.[a-zA-Z0-9](?:[a-zA-Z0-9\-]{0,61}[a-zA-Z0-9])?)*\.[a-zA-Z]{2,}\b',
+    'urls': r'https?://[^\s<>"{}|\\^`\[\]]+',
+    'email_addresses': r'(?<![A-Za-z0-9._%+-])\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b',
+    'file_hashes': r'\b(?:[a-fA-F0-9]{64}|[a-fA-F0-9]{40}|[a-fA-F0-9]{32})\b',
+    'cve_ids': r'CVE-\d{4}-\d{4,7}',
+    'bitcoin_addresses': r'\b[13][a-km-zA-HJ-NP-Z1-9]{25,34}\b'
+}
+
+# Common threat-related keywords
+THREAT_KEYWORDS = [
+    'malware', 'ransomware', 'phishing', 'exploit', 'vulnerability',
+    'breach', 'attack', 'trojan', 'virus', 'botnet', 'ddos',
+    'injection', 'backdoor', 'rootkit', 'spyware', 'adware'
+]
+
+# Organizations/companies (simple heuristic)
+ORG_PATTERNS = [
+    r'\b[A-Z][a-z]+ (?:Inc|Corp|LLC|Ltd|Company|Corporation|Technologies|Systems|Security)\b',
+    r'\b(?:Microsoft|Google|Apple|Amazon|Facebook|Twitter|LinkedIn|GitHub|Cisco|IBM|Oracle)\b'
+]
+
+# Patterns whose character classes already list both cases are compiled
+# without IGNORECASE so the matcher skips case folding on every character
+_CASE_INSENSITIVE = {'urls', 'cve_ids', 'bitcoin_addresses'}
+
+# Compiled once at import and shared by every EntityExtractor
+_COMPILED_PATTERNS = {
+    entity_type: re.compile(pattern, re.IGNORECASE if entity_type in _CASE_INSENSITIVE else 0)
+    for entity_type, pattern in ENTITY_PATTERNS.items()
+}
+_COMPILED_ORG_PATTERNS = [re.compile(pattern) for pattern in ORG_PATTERNS]
+
+# Prefilter keys for the organization patterns, so each scan is skipped on its own
+_ORG_KEYS = tuple(f'organizations_{index}' for index in range(len(ORG_PATTERNS)))
+
+# Dotted-quad address with every octet in 0-255 (leading zeros allowed)
+_OCTET = r'(?:25[0-5]|2[0-4][0-9]|[01]?[0-9]?[0-9])'
+_VALID_IPV4 = re.compile(r'\.'.join([_OCTET] * 4))
+
+# Literal substrings every match of a pattern must contain. Without a
+# prefilter backend, patterns whose literal is absent are skipped outright.
+_REQUIRED_SUBSTRINGS = {
+    'ip_addresses': '.',
+    'domains': '.',
+    'urls': '://',
+    'email_addresses': '@',
+    'cve_ids': '-'
+}
+_ALWAYS_CANDIDATES = frozenset(
+    [entity_type for entity_type in ENTITY_PATTERNS if entity_type not in _REQUIRED_SUBSTRINGS] +
+    list(_ORG_KEYS)
+)
+_THREAT_MATCHER = KeywordMatcher(THREAT_KEYWORDS)
+
+# Built on first use, since compiling the backend database is comparatively slow
+_prefilter: Optional[PatternPrefilter] = None
+
+
+def _get_prefilter() -> PatternPrefilter:
+    """Get the process-wide prefilter over all entity patterns."""
+    global _prefilter
+    if _prefilter is None:
+        # One-pass scan to skip patterns that cannot match the text
+        _prefilter = PatternPrefilter(
+            [(entity_type, compiled.pattern, compiled.flags)
+             for entity_type, compiled in _COMPILED_PATTERNS.items()] +
+            [(key, compiled.pattern, compiled.flags)
+             for key, compiled in zip(_ORG_KEYS, _COMPILED_ORG_PATTERNS)]
+        )
+    return _prefilter
+
+
+# Batches smaller than this are cheaper to process inline than in worker processes
+PARALLEL_BATCH_THRESHOLD = 256
+
 class EntityExtractor:
     """Extracts entities from text content for threat analysis."""
     
+    # Entity types reported as Indicators of Compromise
+    IOC_TYPES = ('ip_addresses', 'domains', 'urls', 'file_hashes', 'cve_ids')
+    
     def __init__(self):
         """Initialize the entity extractor."""
-        # Predefined patterns for common entity types
-        self.patterns = {
-            'ip_addresses': r'\b(?:[0-9]{1,3}\.){3}[0-9]{1,3}\b',
-            'domains': r'\b[a-zA-Z0-9](?:[a-zA-Z0-9\-]{0,61}[a-zA-Z0-9])?(?:\.[a-zA-Z0-9](?:[a-zA-Z0-9\-]{0,61}[a-zA-Z0-9])?)*\.[a-zA-Z]{2,}\b',
-            'urls': r'https?://[^\s<>"{}|\\^`\[\]]+',
-            'email_addresses': r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b',
-            'file_hashes': r'\b[a-fA-F0-9]{32,64}\b',
-            'cve_ids': r'CVE-\d{4}-\d{4,7}',
-            'bitcoin_addresses': r'\b[13][a-km-zA-HJ-NP-Z1-9]{25,34}\b'
-        }
+        # Per-instance copies; edits take effect on the next extraction
+        self.patterns = dict(ENTITY_PATTERNS)
+        self.threat_keywords = list(THREAT_KEYWORDS)
         
-        # Common threat-related keywords
-        self.threat_keywords = [
-            'malware', 'ransomware', 'phishing', 'exploit', 'vulnerability',
-            'breach', 'attack', 'trojan', 'virus', 'botnet', 'ddos',
-            'injection', 'backdoor', 'rootkit', 'spyware', 'adware'
-        ]
+        # Compiled patterns and matchers are shared by every instance until
+        # its tables are edited; the *_source copies record what was compiled
+        self._compiled = _COMPILED_PATTERNS
+        self._org_compiled = _COMPILED_ORG_PATTERNS
+        self._prefilter = _get_prefilter()
+        self._threat_matcher = _THREAT_MATCHER
+        self._patterns_source = dict(ENTITY_PATTERNS)
+        self._threat_keywords_source = list(THREAT_KEYWORDS)
         
-        logger.info("EntityExtractor initialized")
+        logger.debug("EntityExtractor initialized")
     
     def extract_entities(self, text: str) -> Dict[str, List[str]]:
         """
@@ -47,41 +286,100 @@ class EntityExtractor:
         if not text or not text.strip():
             return {}
         
+        self._sync_tables()
+        return self.build_entities(text, self._threat_matcher.find(text.lower()))
+    
+    def build_entities(self, text: str, threat_keywords_found: List[str]) -> Dict[str, List[str]]:
+        """
+        Extract pattern-based entities and combine them with threat keywords.
+        
+        Lets callers that already scanned the text for keywords reuse that
+        result instead of having the extractor scan it again.
+        
+        Args:
+            text: Non-blank text content to analyze
+            threat_keywords_found: Threat keywords present in the text, in
+                THREAT_KEYWORDS order
+            
+        Returns:
+            Dictionary with entity types as keys and lists of found entities as values
+        """
+        self._sync_tables()
         entities = {}
+        candidates = self._candidates(text)
         
         # Extract entities using regex patterns
-        for entity_type, pattern in self.patterns.items():
-            matches = re.findall(pattern, text, re.IGNORECASE)
+        for entity_type, compiled in self._compiled.items():
+            if entity_type not in candidates:
+                continue
+            matches = compiled.findall(text)
             if matches:
                 # Remove duplicates while preserving order
                 entities[entity_type] = list(dict.fromkeys(matches))
         
-        # Extract threat keywords
-        threat_keywords_found = []
-        text_lower = text.lower()
-        for keyword in self.threat_keywords:
-            if keyword in text_lower:
-                threat_keywords_found.append(keyword)
-        
+        # Add threat keywords
         if threat_keywords_found:
             entities['threat_keywords'] = threat_keywords_found
         
         # Extract organizations/companies (simple heuristic)
-        org_patterns = [
-            r'\b[A-Z][a-z]+ (?:Inc|Corp|LLC|Ltd|Company|Corporation|Technologies|Systems|Security)\b',
-            r'\b(?:Microsoft|Google|Apple|Amazon|Facebook|Twitter|LinkedIn|GitHub|Cisco|IBM|Oracle)\b'
-        ]
-        
-        organizations = []
-        for pattern in org_patterns:
-            matches = re.findall(pattern, text)
-            organizations.extend(matches)
+        organizations = {}
+        for key, compiled in zip(_ORG_KEYS, self._org_compiled):
+            if key in candidates:
+                organizations.update(dict.fromkeys(compiled.findall(text)))
         
         if organizations:
-            entities['organizations'] = list(dict.fromkeys(organizations))
+            entities['organizations'] = list(organizations)
         
         return entities
     
+    def _sync_tables(self):
+        """Recompile the patterns or keyword matcher if their tables were edited."""
+        if self.patterns != self._patterns_source:
+            patterns = dict(self.patterns)
+            if patterns == ENTITY_PATTERNS:
+                self._compiled = _COMPILED_PATTERNS
+                self._prefilter = _get_prefilter()
+            else:
+                # Edited patterns match case-insensitively, like the defaults;
+                # the shared prefilter only knows the defaults, so it is dropped
+                self._compiled = {
+                    entity_type: (_COMPILED_PATTERNS[entity_type]
+                                  if ENTITY_PATTERNS.get(entity_type) == pattern
+                                  else re.compile(pattern, re.IGNORECASE))
+                    for entity_type, pattern in patterns.items()
+                }
+                self._prefilter = None
+            self._patterns_source = patterns
+        
+        if self.threat_keywords != self._threat_keywords_source:
+            keywords = list(self.threat_keywords)
+            self._threat_matcher = (
+                _THREAT_MATCHER if keywords == THREAT_KEYWORDS else KeywordMatcher(keywords)
+            )
+            self._threat_keywords_source = keywords
+    
+    def _candidates(self, text: str) -> Set[str]:
+        """
+        Get the entity types whose patterns may match the text.
+        
+        Args:
+            text: Text content to scan
+            
+        Returns:
+            Set of entity types worth running the full pattern for
+        """
+        if self._prefilter is None:
+            return set(self._compiled).union(_ORG_KEYS)
+        
+        candidates = self._prefilter.candidates(text)
+        if candidates is None:
+            candidates = {
+                entity_type for entity_type, required in _REQUIRED_SUBSTRINGS.items()
+                if required in text
+            }
+            candidates.update(_ALWAYS_CANDIDATES)
+        return candidates
+    
     def extract_iocs(self, text: str) -> Dict[str, List[str]]:
         """
         Extract Indicators of Compromise (IOCs) from text.
@@ -92,35 +390,54 @@ class EntityExtractor:
         Returns:
             Dictionary with IOC types and their values
         """
+        self._sync_tables()
         iocs = {}
+        candidates = self._candidates(text)
         
         # Extract specific IOC types
-        ioc_patterns = {
-            'ip_addresses': self.patterns['ip_addresses'],
-            'domains': self.patterns['domains'],
-            'urls': self.patterns['urls'],
-            'file_hashes': self.patterns['file_hashes'],
-            'cve_ids': self.patterns['cve_ids']
-        }
-        
-        for ioc_type, pattern in ioc_patterns.items():
-            matches = re.findall(pattern, text, re.IGNORECASE)
+        get_compiled = self._compiled.get
+        for ioc_type in self.IOC_TYPES:
+            if ioc_type not in candidates:
+                continue
+            matches = get_compiled(ioc_type).findall(text)
             if matches:
                 iocs[ioc_type] = list(dict.fromkeys(matches))
         
         return iocs
     
-    def extract_batch(self, texts: List[str]) -> List[Dict[str, List[str]]]:
+    def extract_batch(self, texts: List[str],
+                      max_workers: Optional[int] = None) -> List[Dict[str, List[str]]]:
         """
         Extract entities from a batch of texts.
         
+        Large batches are spread over worker processes; the stdlib regex
+        engine holds the GIL, so threads would not run in parallel. Workers
+        use the default tables, so an edited extractor runs serially.
+        
         Args:
             texts: List of text strings to analyze
+            max_workers: Number of worker processes (defaults to the CPU count)
             
         Returns:
             List of entity extraction results
         """
-        return [self.extract_entities(text) for text in texts]
+        self._sync_tables()
+        edited = (self._compiled is not _COMPILED_PATTERNS or
+                  self._threat_matcher is not _THREAT_MATCHER)
+        
+        workers = max_workers or os.cpu_count() or 1
+        if edited or workers < 2 or len(texts) < PARALLEL_BATCH_THRESHOLD:
+            return [self.extract_entities(text) for text in texts]
+        
+        try:
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                return list(executor.map(
+                    _extract_entities_worker, texts,
+                    chunksize=max(1, len(texts) // (4 * workers))
+                ))
+        except (OSError, BrokenProcessPool) as e:
+            logger.warning(f"Parallel entity extraction failed, running serially: {e}")
+            return [self.extract_entities(text) for text in texts]
     
     def get_entity_summary(self, entities: Dict[str, List[str]]) -> Dict[str, Any]:
         """
@@ -137,7 +454,7 @@ class EntityExtractor:
             'entity_types': len(entities),
             'counts_by_type': {entity_type: len(entity_list) 
                              for entity_type, entity_list in entities.items()},
-            'has_iocs': any(entity_type in ['ip_addresses', 'domains', 'urls', 'file_hashes', 'cve_ids'] 
+            'has_iocs': any(entity_type in self.IOC_TYPES
                            for entity_type in entities.keys()),
             'has_threat_keywords': 'threat_keywords' in entities
         }
@@ -157,34 +474,46 @@ class EntityExtractor:
         validated = {}
         
         for entity_type, entity_list in entities.items():
-            cleaned_entities = []
+            # Insertion-ordered dict dedupes as entities are accepted
+            cleaned_entities = {}
             
             for entity in entity_list:
                 # Basic validation and cleaning
                 entity = entity.strip()
                 
                 if entity_type == 'ip_addresses':
-                    # Validate IP address format
-                    parts = entity.split('.')
-                    if len(parts) == 4 and all(0 <= int(part) <= 255 for part in parts if part.isdigit()):
-                        cleaned_entities.append(entity)
+                    # Validate IP address format in one match, without splitting
+                    if _VALID_IPV4.fullmatch(entity):
+                        cleaned_entities[entity] = None
                 
                 elif entity_type == 'domains':
                     # Basic domain validation
                     if '.' in entity and len(entity) > 3:
-                        cleaned_entities.append(entity.lower())
+                        cleaned_entities[entity.lower()] = None
                 
                 elif entity_type == 'urls':
                     # Basic URL validation
                     if entity.startswith(('http://', 'https://')):
-                        cleaned_entities.append(entity)
+                        cleaned_entities[entity] = None
                 
                 else:
                     # For other types, just add if not empty
                     if entity:
-                        cleaned_entities.append(entity)
+                        cleaned_entities[entity] = None
             
             if cleaned_entities:
-                validated[entity_type] = list(dict.fromkeys(cleaned_entities))
+                validated[entity_type] = list(cleaned_entities)
         
         return validated
+
+
+# Extractor used inside batch worker processes, created on first use
+_worker_extractor: Optional[EntityExtractor] = None
+
+
+def _extract_entities_worker(text: str) -> Dict[str, List[str]]:
+    """Extract entities in a worker process."""
+    global _worker_extractor
+    if _worker_extractor is None:
+        _worker_extractor = EntityExtractor()
+    return _worker_extractor.extract_entities(text)
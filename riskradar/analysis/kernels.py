@@ -0,0 +1,144 @@
+"""
+Numeric kernels for risk scoring and risk level lookup.
+
+The kernels are compiled to native code with Numba when it is installed and
+run as plain Python / NumPy otherwise, so callers never need to check.
+"""
+
+from bisect import bisect_right
+import numpy as np
+
+# Optional JIT compiler; kernels fall back to interpreted Python
+try:
+    from numba import njit, prange
+except ImportError:
+    njit = None
+
+# Lower bounds of each risk level above "minimal", in ascending order
+RISK_THRESHOLDS = (0.2, 0.4, 0.6, 0.8)
+RISK_LEVELS = ('minimal', 'low', 'medium', 'high', 'critical')
+
+_THRESHOLD_ARRAY = np.array(RISK_THRESHOLDS)
+
+
+def _score_risk(severity, confidence, sentiment, source, w_severity, w_confidence,
+                w_sentiment, w_source):
+    """Weighted risk score for one incident, clamped to [0, 1]."""
+    # Convert sentiment from [-1, 1] to [0, 1] where negative is higher risk
+    sentiment_component = max(0.0, (1.0 - sentiment) / 2.0)
+    risk_score = (
+        severity * w_severity +
+        confidence * w_confidence +
+        sentiment_component * w_sentiment +
+        source * w_source
+    )
+    return min(1.0, max(0.0, risk_score))
+
+
+def _score_risk_batch(severity, confidence, sentiment, source, w_severity, w_confidence,
+                      w_sentiment, w_source):
+    """Vectorized _score_risk over equally sized float64 arrays."""
+    # fmax/fmin clamp NaN the same way the builtin max/min do in _score_risk
+    risk_scores = (
+        severity * w_severity +
+        confidence * w_confidence +
+        np.fmax(0.0, (1.0 - sentiment) / 2.0) * w_sentiment +
+        source * w_source
+    )
+    return np.fmin(1.0, np.fmax(0.0, risk_scores))
+
+
+if njit is not None:
+    # No fastmath: scores must stay identical to the interpreted kernels
+    score_risk = njit(cache=True)(_score_risk)
+
+    @njit(cache=True, parallel=True)
+    def score_risk_batch(severity, confidence, sentiment, source, w_severity,
+                         w_confidence, w_sentiment, w_source):
+        """Vectorized score_risk over equally sized float64 arrays."""
+        risk_scores = np.empty(severity.shape[0])
+        for i in prange(severity.shape[0]):
+            risk_scores[i] = score_risk(
+                severity[i], confidence[i], sentiment[i], source[i],
+                w_severity, w_confidence, w_sentiment, w_source
+            )
+        return risk_scores
+else:
+    score_risk = _score_risk
+    score_risk_batch = _score_risk_batch
+
+
+def _pattern_factors(incident_masks, historical_masks, historical_risk_scores,
+                     escalation_factor):
+    """
+    Historical pattern factor for each incident keyword mask.
+    
+    Averages the risk scores of the historical incidents sharing at least one
+    keyword bit, scaled by escalation_factor and capped at 10; incidents with
+    no overlap get the neutral 5.0. Masks may be uint64 or Python int objects.
+    """
+    pattern_factors = np.full(len(incident_masks), 5.0)
+    for i, incident_mask in enumerate(incident_masks):
+        if not incident_mask:
+            continue
+        
+        similar = (historical_masks & incident_mask) != 0
+        if similar.any():
+            # Summed in order as a list to match the scalar path exactly
+            similar_risk_scores = historical_risk_scores[similar].tolist()
+            avg_risk = sum(similar_risk_scores) / len(similar_risk_scores)
+            pattern_factors[i] = min(10.0, avg_risk * escalation_factor)
+    
+    return pattern_factors
+
+
+if njit is not None:
+    # No fastmath: sums must keep the sequential order of the Python path
+    @njit(cache=True, parallel=True)
+    def _pattern_factors_uint64(incident_masks, historical_masks, historical_risk_scores,
+                                escalation_factor):
+        """_pattern_factors over uint64 masks, one incident per thread."""
+        pattern_factors = np.full(incident_masks.shape[0], 5.0)
+        for i in prange(incident_masks.shape[0]):
+            incident_mask = incident_masks[i]
+            risk_sum = 0.0
+            similar_count = 0
+            for j in range(historical_masks.shape[0]):
+                if historical_masks[j] & incident_mask:
+                    risk_sum += historical_risk_scores[j]
+                    similar_count += 1
+            if similar_count:
+                pattern_factors[i] = min(10.0, (risk_sum / similar_count) * escalation_factor)
+        return pattern_factors
+else:
+    _pattern_factors_uint64 = _pattern_factors
+
+
+def pattern_factors(incident_masks: np.ndarray, historical_masks: np.ndarray,
+                    historical_risk_scores: np.ndarray, escalation_factor: float) -> np.ndarray:
+    """
+    Historical pattern factor for a batch of keyword masks.
+    
+    uint64 masks run through the compiled kernel when Numba is installed;
+    wider (object) masks always take the NumPy path.
+    """
+    if incident_masks.dtype == np.uint64 and historical_masks.dtype == np.uint64:
+        return _pattern_factors_uint64(
+            incident_masks, historical_masks, historical_risk_scores, float(escalation_factor)
+        )
+    return _pattern_factors(
+        incident_masks, historical_masks, historical_risk_scores, escalation_factor
+    )
+
+
+def risk_level(risk_score: float) -> str:
+    """Map a risk score to its level name with a single table lookup."""
+    # NaN fails every threshold comparison, so it stays "minimal"
+    if risk_score != risk_score:
+        return RISK_LEVELS[0]
+    return RISK_LEVELS[bisect_right(RISK_THRESHOLDS, risk_score)]
+
+
+def risk_level_indexes(risk_scores: np.ndarray) -> np.ndarray:
+    """Indexes into RISK_LEVELS for an array of clamped (non-NaN) risk scores."""
+    return np.searchsorted(_THRESHOLD_ARRAY, risk_scores, side='right')
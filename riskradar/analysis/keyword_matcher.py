@@ -0,0 +1,95 @@
+"""
+Multi-keyword matching module for threat content analysis.
+"""
+
+from typing import Dict, Iterable, List
+
+# Optional Aho-Corasick automaton; matching falls back to substring checks
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
+
+
+class KeywordMatcher:
+    """
+    Finds which of a fixed list of keywords occur in a text.
+    
+    When pyahocorasick is installed all keywords are compiled into a single
+    Aho-Corasick automaton, so the text is scanned once no matter how many
+    keywords are registered. Otherwise each keyword is checked with a
+    substring search.
+    """
+    
+    def __init__(self, keywords: Iterable[str]):
+        """
+        Initialize the matcher.
+        
+        Args:
+            keywords: Keywords to look for, matched case-sensitively
+        """
+        self.keywords = list(keywords)
+        self._automaton = None
+        
+        if ahocorasick is not None and all(self.keywords):
+            # Map each distinct keyword to every position it holds in the list
+            positions: Dict[str, List[int]] = {}
+            for index, keyword in enumerate(self.keywords):
+                positions.setdefault(keyword, []).append(index)
+            
+            automaton = ahocorasick.Automaton()
+            for keyword, indexes in positions.items():
+                automaton.add_word(keyword, tuple(indexes))
+            automaton.make_automaton()
+            self._automaton = automaton
+    
+    def find(self, text: str) -> List[str]:
+        """
+        Get the keywords that occur in the text.
+        
+        Args:
+            text: Text content to search
+        
+        Returns:
+            Matching keywords in the order they were registered
+        """
+        keywords = self.keywords
+        return [keywords[index] for index in self.find_indexes(text)]
+    
+    def find_indexes(self, text: str) -> List[int]:
+        """
+        Get the positions in the keyword list of keywords that occur in the text.
+        
+        Args:
+            text: Text content to search
+        
+        Returns:
+            Sorted indexes into the registered keyword list
+        """
+        if self._automaton is None or not self.keywords:
+            return [index for index, keyword in enumerate(self.keywords) if keyword in text]
+        
+        found = set()
+        for _, indexes in self._automaton.iter(text):
+            found.update(indexes)
+        
+        return sorted(found)
+    
+    def count(self, text: str) -> int:
+        """
+        Count the distinct registered keywords that occur in the text.
+        
+        Args:
+            text: Text content to search
+            
+        Returns:
+            Number of keyword list entries found in the text
+        """
+        if self._automaton is None or not self.keywords:
+            return sum(1 for keyword in self.keywords if keyword in text)
+        
+        found = set()
+        for _, indexes in self._automaton.iter(text):
+            found.update(indexes)
+        
+        return len(found)
@@ -3,11 +3,18 @@ Risk assessment module for threat evaluation.
 """
 
 from typing import Dict, Any, List
+from functools import lru_cache
 import logging
+import numpy as np
 from ..core.models import Incident
+from .kernels import RISK_LEVELS, risk_level, risk_level_indexes
 
 logger = logging.getLogger(__name__)
 
+# Weights of the severity, confidence, sentiment and source reliability
+# factors, shared by assess_risk and the batch path
+RISK_FACTOR_WEIGHTS = (0.4, 0.3, 0.2, 0.1)
+
 
 class RiskAssessor:
     """Assesses risk levels of incidents and threats."""
@@ -30,7 +37,7 @@ class RiskAssessor:
                 'blog': 0.5
             }
         }
-        logger.info("RiskAssessor initialized")
+        logger.debug("RiskAssessor initialized")
     
     def assess_risk(self, incident: Incident) -> float:
         """
@@ -47,24 +54,22 @@ class RiskAssessor:
             incident.severity.lower(), 0.5
         )
         
-        # Adjust based on confidence score
-        confidence_factor = incident.confidence_score
-        
-        # Adjust based on sentiment (more negative = higher risk)
-        sentiment_factor = max(0.0, -incident.sentiment_score + 0.5)
-        
         # Source reliability factor
         source_type = incident.incident_metadata.get('source_type', 'unknown')
         source_reliability = self.risk_factors['source_reliability'].get(
             source_type, 0.5
         )
         
+        # Adjust based on sentiment (more negative = higher risk)
+        sentiment_factor = max(0.0, -incident.sentiment_score + 0.5)
+        
         # Calculate weighted risk score
+        w_severity, w_confidence, w_sentiment, w_source = RISK_FACTOR_WEIGHTS
         risk_score = (
-            severity_weight * 0.4 +
-            confidence_factor * 0.3 +
-            sentiment_factor * 0.2 +
-            source_reliability * 0.1
+            severity_weight * w_severity +
+            incident.confidence_score * w_confidence +
+            sentiment_factor * w_sentiment +
+            source_reliability * w_source
         )
         
         return min(1.0, max(0.0, risk_score))
@@ -79,16 +84,7 @@ class RiskAssessor:
         Returns:
             Risk category string
         """
-        if risk_score >= 0.8:
-            return "critical"
-        elif risk_score >= 0.6:
-            return "high"
-        elif risk_score >= 0.4:
-            return "medium"
-        elif risk_score >= 0.2:
-            return "low"
-        else:
-            return "minimal"
+        return risk_level(risk_score)
     
     def assess_batch(self, incidents: List[Incident]) -> List[Dict[str, Any]]:
         """
@@ -100,24 +96,24 @@ class RiskAssessor:
         Returns:
             List of risk assessment results
         """
-        results = []
-        for incident in incidents:
-            risk_score = self.assess_risk(incident)
-            risk_category = self.categorize_risk(risk_score)
-            
-            results.append({
+        risk_scores, risk_buckets = self._score_vector(incidents)
+        
+        return [
+            {
                 'incident_id': incident.id,
                 'risk_score': risk_score,
-                'risk_category': risk_category,
+                'risk_category': RISK_LEVELS[bucket],
                 'factors': {
                     'severity': incident.severity,
                     'confidence': incident.confidence_score,
                     'sentiment': incident.sentiment_score,
                     'source_type': incident.incident_metadata.get('source_type', 'unknown')
                 }
-            })
-        
-        return results
+            }
+            for incident, risk_score, bucket in zip(
+                incidents, risk_scores.tolist(), risk_buckets.tolist()
+            )
+        ]
     
     def get_risk_summary(self, incidents: List[Incident]) -> Dict[str, Any]:
         """
@@ -137,17 +133,77 @@ class RiskAssessor:
                 'highest_risk': 0.0
             }
         
-        risk_scores = [self.assess_risk(incident) for incident in incidents]
-        risk_categories = [self.categorize_risk(score) for score in risk_scores]
+        risk_scores, risk_buckets = self._score_vector(incidents)
         
-        # Count risk categories
-        risk_distribution = {}
-        for category in risk_categories:
-            risk_distribution[category] = risk_distribution.get(category, 0) + 1
+        # Count risk categories, listed in order of first appearance
+        counts = np.bincount(risk_buckets, minlength=len(RISK_LEVELS))
+        present, first_seen = np.unique(risk_buckets, return_index=True)
+        risk_distribution = {
+            RISK_LEVELS[bucket]: int(counts[bucket])
+            for bucket in present[np.argsort(first_seen)].tolist()
+        }
         
         return {
             'total_incidents': len(incidents),
             'risk_distribution': risk_distribution,
-            'average_risk': sum(risk_scores) / len(risk_scores),
-            'highest_risk': max(risk_scores)
+            'average_risk': float(risk_scores.mean()),
+            'highest_risk': float(risk_scores.max())
         }
+    
+    def _score_vector(self, incidents: List[Incident]):
+        """
+        Compute risk scores and category indexes for many incidents at once.
+        
+        Applies the same formula as assess_risk using array arithmetic, so
+        the per-incident cost is only the attribute lookups.
+        
+        Args:
+            incidents: List of incidents to score
+            
+        Returns:
+            Tuple of (risk scores, indexes into RISK_LEVELS) arrays
+        """
+        count = len(incidents)
+        severity_weights = self.risk_factors['severity_weights']
+        source_reliability = self.risk_factors['source_reliability']
+        
+        severity = np.fromiter(
+            (severity_weights.get(incident.severity.lower(), 0.5) for incident in incidents),
+            dtype=np.float64, count=count
+        )
+        confidence = np.fromiter(
+            (incident.confidence_score for incident in incidents),
+            dtype=np.float64, count=count
+        )
+        sentiment = np.fromiter(
+            (incident.sentiment_score for incident in incidents),
+            dtype=np.float64, count=count
+        )
+        source = np.fromiter(
+            (source_reliability.get(incident.incident_metadata.get('source_type', 'unknown'), 0.5)
+             for incident in incidents),
+            dtype=np.float64, count=count
+        )
+        
+        # fmax/fmin clamp NaN the same way the builtin max/min do in assess_risk
+        w_severity, w_confidence, w_sentiment, w_source = RISK_FACTOR_WEIGHTS
+        risk_scores = (
+            severity * w_severity +
+            confidence * w_confidence +
+            np.fmax(0.0, -sentiment + 0.5) * w_sentiment +
+            source * w_source
+        )
+        risk_scores = np.fmin(1.0, np.fmax(0.0, risk_scores))
+        
+        return risk_scores, risk_level_indexes(risk_scores)
+
+
+@lru_cache(maxsize=1)
+def get_risk_assessor() -> RiskAssessor:
+    """
+    Get the process-wide risk assessor, creating it on first use.
+    
+    Returns:
+        Shared RiskAssessor instance
+    """
+    return RiskAssessor()
@@ -2,8 +2,11 @@
 Risk scoring module for threat evaluation.
 """
 
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Sequence
 import logging
+import numpy as np
+
+from .kernels import RISK_LEVELS, risk_level, risk_level_indexes, score_risk, score_risk_batch
 
 logger = logging.getLogger(__name__)
 
@@ -37,7 +40,7 @@ class RiskScorer:
             'unknown': 0.3
         }
         
-        logger.info("RiskScorer initialized")
+        logger.debug("RiskScorer initialized")
     
     def calculate_risk_score(self, 
                            severity: str,
@@ -56,28 +59,24 @@ class RiskScorer:
         Returns:
             Risk score between 0.0 and 1.0
         """
+        # Inputs usually arrive lowercase already, so only fold case on a miss
         # Severity component
-        severity_component = self.severity_scores.get(severity.lower(), 0.5)
-        
-        # Confidence component (higher confidence = higher risk if threat is confirmed)
-        confidence_component = confidence_score
-        
-        # Sentiment component (more negative sentiment = higher risk)
-        # Convert sentiment from [-1, 1] to [0, 1] where negative is higher risk
-        sentiment_component = max(0.0, (1.0 - sentiment_score) / 2.0)
+        severity_component = self.severity_scores.get(severity)
+        if severity_component is None:
+            severity_component = self.severity_scores.get(severity.lower(), 0.5)
         
         # Source reliability component
-        source_component = self.source_scores.get(source_type.lower(), 0.3)
+        source_component = self.source_scores.get(source_type)
+        if source_component is None:
+            source_component = self.source_scores.get(source_type.lower(), 0.3)
         
-        # Calculate weighted score
-        risk_score = (
-            severity_component * self.scoring_weights['severity'] +
-            confidence_component * self.scoring_weights['confidence'] +
-            sentiment_component * self.scoring_weights['sentiment'] +
-            source_component * self.scoring_weights['source_reliability']
+        # Confidence raises risk directly; more negative sentiment raises risk
+        weights = self.scoring_weights
+        return score_risk(
+            float(severity_component), float(confidence_score), float(sentiment_score),
+            float(source_component), weights['severity'], weights['confidence'],
+            weights['sentiment'], weights['source_reliability']
         )
-        
-        return min(1.0, max(0.0, risk_score))
     
     def get_risk_level(self, risk_score: float) -> str:
         """
@@ -89,16 +88,7 @@ class RiskScorer:
         Returns:
             Risk level string
         """
-        if risk_score >= 0.8:
-            return "critical"
-        elif risk_score >= 0.6:
-            return "high"
-        elif risk_score >= 0.4:
-            return "medium"
-        elif risk_score >= 0.2:
-            return "low"
-        else:
-            return "minimal"
+        return risk_level(risk_score)
     
     def score_batch(self, incidents_data: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         """
@@ -110,31 +100,75 @@ class RiskScorer:
         Returns:
             List of scoring results
         """
-        results = []
+        # Split the records into one column per factor and score them together
+        severities = [data.get('severity', 'medium') for data in incidents_data]
+        confidence_scores = [data.get('confidence_score', 0.5) for data in incidents_data]
+        sentiment_scores = [data.get('sentiment_score', 0.0) for data in incidents_data]
+        source_types = [data.get('source_type', 'unknown') for data in incidents_data]
         
-        for incident_data in incidents_data:
-            risk_score = self.calculate_risk_score(
-                severity=incident_data.get('severity', 'medium'),
-                confidence_score=incident_data.get('confidence_score', 0.5),
-                sentiment_score=incident_data.get('sentiment_score', 0.0),
-                source_type=incident_data.get('source_type', 'unknown')
-            )
-            
-            risk_level = self.get_risk_level(risk_score)
-            
-            results.append({
+        risk_scores = self.score_batch_soa(
+            severities, confidence_scores, sentiment_scores, source_types
+        )
+        risk_buckets = risk_level_indexes(risk_scores)
+        
+        return [
+            {
                 'incident_id': incident_data.get('id'),
                 'risk_score': risk_score,
-                'risk_level': risk_level,
+                'risk_level': RISK_LEVELS[bucket],
                 'components': {
-                    'severity': incident_data.get('severity', 'medium'),
-                    'confidence': incident_data.get('confidence_score', 0.5),
-                    'sentiment': incident_data.get('sentiment_score', 0.0),
-                    'source_type': incident_data.get('source_type', 'unknown')
+                    'severity': severity,
+                    'confidence': confidence,
+                    'sentiment': sentiment,
+                    'source_type': source_type
                 }
-            })
+            }
+            for incident_data, severity, confidence, sentiment, source_type, risk_score, bucket
+            in zip(
+                incidents_data, severities, confidence_scores, sentiment_scores,
+                source_types, risk_scores.tolist(), risk_buckets.tolist()
+            )
+        ]
+    
+    def score_batch_soa(self,
+                        severities: Sequence[str],
+                        confidence_scores: Sequence[float],
+                        sentiment_scores: Sequence[float],
+                        source_types: Sequence[str]) -> np.ndarray:
+        """
+        Score a batch of incidents given as one column per factor.
+        
+        Severity and source names are looked up once per distinct value
+        rather than once per incident.
         
-        return results
+        Args:
+            severities: Severity level string for each incident
+            confidence_scores: Confidence score (0.0 to 1.0) for each incident
+            sentiment_scores: Sentiment score (-1.0 to 1.0) for each incident
+            source_types: Type of source for each incident
+            
+        Returns:
+            Array of risk scores between 0.0 and 1.0
+        """
+        weights = self.scoring_weights
+        return score_risk_batch(
+            self._lookup_scores(severities, self.severity_scores, 0.5),
+            np.asarray(confidence_scores, dtype=np.float64),
+            np.asarray(sentiment_scores, dtype=np.float64),
+            self._lookup_scores(source_types, self.source_scores, 0.3),
+            weights['severity'], weights['confidence'], weights['sentiment'],
+            weights['source_reliability']
+        )
+    
+    @staticmethod
+    def _lookup_scores(names: Sequence[str], scores: Dict[str, float], default: float) -> np.ndarray:
+        """Map a column of names to their scores, looking up each distinct name once."""
+        unique_names, codes = np.unique(np.asarray(names, dtype=object), return_inverse=True)
+        table = np.array(
+            [scores.get(name.lower(), default) for name in unique_names.tolist()],
+            dtype=np.float64
+        )
+        return table[codes.reshape(-1)]
     
     def update_weights(self, new_weights: Dict[str, float]) -> bool:
         """
@@ -3,10 +3,28 @@ Sentiment analysis module for threat assessment.
 """
 
 from typing import Dict, Any
+from functools import lru_cache
 import logging
 
+from .keyword_matcher import KeywordMatcher
+
 logger = logging.getLogger(__name__)
 
+# Placeholder heuristic - will be replaced with actual ML model
+NEGATIVE_KEYWORDS = [
+    'threat', 'attack', 'breach', 'hack', 'malware', 'virus',
+    'exploit', 'vulnerability', 'compromise', 'incident',
+    'dangerous', 'critical', 'severe', 'emergency'
+]
+
+# Score for 0 to 4 distinct negative keywords; five or more is very negative
+_SCORE_BY_NEGATIVE_COUNT = (
+    0.1,         # Slightly positive if no negative keywords
+    -0.3, -0.3,  # Mildly negative
+    -0.6, -0.6   # Moderately negative
+)
+_VERY_NEGATIVE_SCORE = -0.9
+
 
 class SentimentAnalyzer:
     """Analyzes sentiment of text content for threat assessment."""
@@ -14,7 +32,11 @@ class SentimentAnalyzer:
     def __init__(self):
         """Initialize the sentiment analyzer."""
         self.model_loaded = False
-        logger.info("SentimentAnalyzer initialized (placeholder implementation)")
+        
+        self.negative_keywords = list(NEGATIVE_KEYWORDS)
+        self._negative_matcher = KeywordMatcher(self.negative_keywords)
+        
+        logger.debug("SentimentAnalyzer initialized (placeholder implementation)")
     
     def analyze_sentiment(self, text: str) -> float:
         """
@@ -29,26 +51,23 @@ class SentimentAnalyzer:
         if not text or not text.strip():
             return 0.0
         
-        # Placeholder implementation - will be replaced with actual ML model
         # For now, return a simple heuristic based on negative keywords
-        negative_keywords = [
-            'threat', 'attack', 'breach', 'hack', 'malware', 'virus',
-            'exploit', 'vulnerability', 'compromise', 'incident',
-            'dangerous', 'critical', 'severe', 'emergency'
-        ]
-        
-        text_lower = text.lower()
-        negative_count = sum(1 for keyword in negative_keywords if keyword in text_lower)
+        return self.score_negative_count(self._negative_matcher.count(text.lower()))
+    
+    def score_negative_count(self, negative_count: int) -> float:
+        """
+        Convert the number of distinct negative keywords found into a score.
         
+        Args:
+            negative_count: Number of distinct negative keywords in the text
+            
+        Returns:
+            Sentiment score between -1.0 (very negative) and 1.0 (very positive)
+        """
         # Simple scoring: more negative keywords = more negative sentiment
-        if negative_count == 0:
-            return 0.1  # Slightly positive if no negative keywords
-        elif negative_count <= 2:
-            return -0.3  # Mildly negative
-        elif negative_count <= 4:
-            return -0.6  # Moderately negative
-        else:
-            return -0.9  # Very negative
+        if negative_count < len(_SCORE_BY_NEGATIVE_COUNT):
+            return _SCORE_BY_NEGATIVE_COUNT[negative_count]
+        return _VERY_NEGATIVE_SCORE
     
     def analyze_batch(self, texts: list) -> list:
         """
@@ -95,8 +114,15 @@ class SentimentAnalyzer:
         }
 
 
-# Global analyzer instance
-_analyzer = SentimentAnalyzer()
+@lru_cache(maxsize=1)
+def get_sentiment_analyzer() -> SentimentAnalyzer:
+    """
+    Get the process-wide sentiment analyzer, creating it on first use.
+    
+    Returns:
+        Shared SentimentAnalyzer instance
+    """
+    return SentimentAnalyzer()
 
 
 def analyze_sentiment(text: str) -> Dict[str, Any]:
@@ -109,5 +135,6 @@ def analyze_sentiment(text: str) -> Dict[str, Any]:
     Returns:
         Dictionary with sentiment analysis results
     """
-    score = _analyzer.analyze_sentiment(text)
-    return _analyzer.get_sentiment_summary(score)
+    analyzer = get_sentiment_analyzer()
+    score = analyzer.analyze_sentiment(text)
+    return analyzer.get_sentiment_summary(score)
@@ -0,0 +1,62 @@
+"""
+Combined text analysis module for threat content.
+
+Runs entity extraction, IOC extraction and sentiment analysis over a text
+with each kind of scan done once: a single keyword pass covers both threat
+and sentiment keywords, and IOCs are taken from the extracted entities.
+"""
+
+from typing import Dict, Any
+
+from .entity_extractor import EntityExtractor, THREAT_KEYWORDS
+from .keyword_matcher import KeywordMatcher
+from .sentiment import NEGATIVE_KEYWORDS, get_sentiment_analyzer
+
+# Threat keywords occupy the first positions of the combined matcher
+_THREAT_KEYWORD_COUNT = len(THREAT_KEYWORDS)
+_KEYWORD_MATCHER = KeywordMatcher(THREAT_KEYWORDS + NEGATIVE_KEYWORDS)
+
+# Global analyzer instances
+_extractor = EntityExtractor()
+_sentiment_analyzer = get_sentiment_analyzer()
+
+
+def analyze_text(text: str) -> Dict[str, Any]:
+    """
+    Analyze text content in a single pass.
+    
+    Equivalent to calling EntityExtractor.extract_entities,
+    EntityExtractor.extract_iocs and SentimentAnalyzer.analyze_sentiment
+    on the same text.
+    
+    Args:
+        text: Text content to analyze
+        
+    Returns:
+        Dictionary with entities, iocs and sentiment_score
+    """
+    if not text or not text.strip():
+        return {
+            'entities': {},
+            'iocs': {},
+            'sentiment_score': 0.0
+        }
+    
+    threat_keywords_found = []
+    negative_count = 0
+    for index in _KEYWORD_MATCHER.find_indexes(text.lower()):
+        if index < _THREAT_KEYWORD_COUNT:
+            threat_keywords_found.append(THREAT_KEYWORDS[index])
+        else:
+            negative_count += 1
+    
+    entities = _extractor.build_entities(text, threat_keywords_found)
+    
+    return {
+        'entities': entities,
+        'iocs': {
+            ioc_type: list(entities[ioc_type])
+            for ioc_type in EntityExtractor.IOC_TYPES if ioc_type in entities
+        },
+        'sentiment_score': _sentiment_analyzer.score_negative_count(negative_count)
+    }
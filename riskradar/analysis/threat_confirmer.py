@@ -4,11 +4,46 @@ Determines if analyzed incidents should be confirmed as threats.
 """
 
 import logging
-from typing import Dict, List, Optional, Tuple
+from collections import Counter
+from functools import partial
+from types import MappingProxyType
+from typing import Callable, Dict, List, Mapping, Optional, Tuple, Union
 from datetime import datetime, timedelta
 from dataclasses import dataclass
+import numpy as np
 
 from ..core.models import Incident, RiskAssessment, SeverityLevel, IncidentStatus
+from .kernels import pattern_factors
+
+# Fixed fragments of confirmation reasons
+_CONTRIBUTING_HEADER = "Contributing factors:\n"
+_LIMITING_HEADER = "Limiting factors:\n"
+_RELIABLE_SOURCE = "✓ Reliable source type\n"
+_UNRELIABLE_SOURCE = "⚠ Lower reliability source\n"
+_ESCALATING_PATTERN = "✓ Similar recent incidents detected (escalating pattern)\n"
+_NO_PATTERN = "⚠ No recent similar incidents\n"
+
+
+# Shared read-only default for ConfirmationCriteria.source_type_weights
+DEFAULT_SOURCE_TYPE_WEIGHTS = MappingProxyType({
+    "government": 1.0,
+    "news": 0.9,
+    "blog": 0.8,
+    "social_media": 0.6,
+    "forum": 0.5,
+    "other": 0.4
+})
+
+
+def _build_source_weight_table(weights: Mapping[str, float]) -> Tuple[Dict[str, int], np.ndarray]:
+    """Map each source type to a small-int code and its weight to that index."""
+    source_codes = {source_type: code for code, source_type in enumerate(weights)}
+    # The last code is reserved for unknown source types
+    weight_table = np.array(list(weights.values()) + [0.5], dtype=float)
+    return source_codes, weight_table
+
+
+_DEFAULT_SOURCE_WEIGHT_TABLE = _build_source_weight_table(DEFAULT_SOURCE_TYPE_WEIGHTS)
 
 
 @dataclass
@@ -26,18 +61,11 @@ class ConfirmationCriteria:
     escalation_factor: float = 1.2  # Boost score if similar recent incidents
     
     # Source type weights
-    source_type_weights: Dict[str, float] = None
+    source_type_weights: Mapping[str, float] = None
     
     def __post_init__(self):
         if self.source_type_weights is None:
-            self.source_type_weights = {
-                "government": 1.0,
-                "news": 0.9,
-                "blog": 0.8,
-                "social_media": 0.6,
-                "forum": 0.5,
-                "other": 0.4
-            }
+            self.source_type_weights = DEFAULT_SOURCE_TYPE_WEIGHTS
 
 
 class ThreatConfirmer:
@@ -60,27 +88,41 @@ class ThreatConfirmer:
         self, 
         incident: Incident, 
         risk_assessment: Optional[RiskAssessment] = None,
-        historical_incidents: Optional[List[Incident]] = None
-    ) -> Tuple[bool, float, str]:
+        historical_incidents: Optional[List[Incident]] = None,
+        defer_reason: bool = False,
+        cutoff_time: Optional[datetime] = None
+    ) -> Tuple[bool, float, Union[str, Callable[[], str]]]:
         """
         Evaluate if an incident should be confirmed as a threat.
         
+        Args:
+            defer_reason: Return a zero-argument callable that builds the
+                reason on demand instead of the reason text
+            cutoff_time: Start of the recent history window; computed from
+                the current time if not given
+        
         Returns:
             Tuple of (should_confirm, confidence_score, reason)
         """
         try:
             # Calculate confirmation score
             confirmation_score, factors = await self._calculate_confirmation_score(
-                incident, risk_assessment, historical_incidents
+                incident, risk_assessment, historical_incidents, cutoff_time
             )
             
             # Determine if should confirm
             should_confirm = confirmation_score >= self.criteria.min_risk_score
             
             # Generate explanation
-            reason = self._generate_confirmation_reason(
-                incident, confirmation_score, factors, should_confirm
-            )
+            if defer_reason:
+                reason = partial(
+                    self._generate_confirmation_reason,
+                    incident, confirmation_score, factors, should_confirm
+                )
+            else:
+                reason = self._generate_confirmation_reason(
+                    incident, confirmation_score, factors, should_confirm
+                )
             
             self.logger.info(
                 f"Threat evaluation for '{incident.title[:50]}...': "
@@ -91,13 +133,15 @@ class ThreatConfirmer:
             
         except Exception as e:
             self.logger.error(f"Error evaluating incident {incident.id}: {e}")
-            return False, 0.0, f"Evaluation error: {str(e)}"
+            error_reason = f"Evaluation error: {str(e)}"
+            return False, 0.0, (lambda: error_reason) if defer_reason else error_reason
     
     async def _calculate_confirmation_score(
         self,
         incident: Incident,
         risk_assessment: Optional[RiskAssessment],
-        historical_incidents: Optional[List[Incident]]
+        historical_incidents: Optional[List[Incident]],
+        cutoff_time: Optional[datetime] = None
     ) -> Tuple[float, Dict[str, float]]:
         """Calculate the overall confirmation score and contributing factors."""
         
@@ -122,7 +166,9 @@ class ThreatConfirmer:
         factors["keyword_factor"] = keyword_factor
         
         # 5. Historical pattern factor
-        pattern_factor = self._evaluate_historical_patterns(incident, historical_incidents)
+        pattern_factor = self._evaluate_historical_patterns(
+            incident, historical_incidents, cutoff_time
+        )
         factors["pattern_factor"] = pattern_factor
         
         # 6. Risk assessment factor (if available)
@@ -198,25 +244,30 @@ class ThreatConfirmer:
     def _evaluate_historical_patterns(
         self, 
         incident: Incident, 
-        historical_incidents: Optional[List[Incident]]
+        historical_incidents: Optional[List[Incident]],
+        cutoff_time: Optional[datetime] = None
     ) -> float:
-        """Evaluate based on historical incident patterns."""
+        """
+        Evaluate based on historical incident patterns.
+        
+        Args:
+            cutoff_time: Start of the recent window; bulk_evaluate_incidents
+                computes it once with _recent_cutoff() for the whole batch
+        """
         if not historical_incidents:
             return 5.0  # Neutral score
         
         # Look for similar incidents in recent history
-        cutoff_time = datetime.utcnow() - timedelta(
-            hours=self.criteria.recent_incident_window_hours
-        )
+        if cutoff_time is None:
+            cutoff_time = self._recent_cutoff()
+        
+        incident_keywords = set(incident.keywords)
         
         recent_similar = []
         for hist_incident in historical_incidents:
             if hist_incident.created_at >= cutoff_time:
                 # Check for keyword overlap
-                keyword_overlap = len(
-                    set(incident.keywords) & set(hist_incident.keywords)
-                )
-                if keyword_overlap >= 1:
+                if not incident_keywords.isdisjoint(hist_incident.keywords):
                     recent_similar.append(hist_incident)
         
         if recent_similar:
@@ -226,6 +277,10 @@ class ThreatConfirmer:
         else:
             return 5.0  # No pattern detected
     
+    def _recent_cutoff(self) -> datetime:
+        """Start of the window in which historical incidents count as recent."""
+        return datetime.utcnow() - timedelta(hours=self.criteria.recent_incident_window_hours)
+    
     def _evaluate_risk_assessment(
         self, 
         risk_assessment: Optional[RiskAssessment]
@@ -253,59 +308,257 @@ class ThreatConfirmer:
         """Generate human-readable explanation for confirmation decision."""
         
         if confirmed:
-            reason = f"THREAT CONFIRMED (Score: {score:.1f}/10)\n\n"
-            reason += "Contributing factors:\n"
+            parts = [f"THREAT CONFIRMED (Score: {score:.1f}/10)\n\n", _CONTRIBUTING_HEADER]
         else:
-            reason = f"Threat not confirmed (Score: {score:.1f}/10)\n\n"
-            reason += "Limiting factors:\n"
+            parts = [f"Threat not confirmed (Score: {score:.1f}/10)\n\n", _LIMITING_HEADER]
         
         # Analyze key factors
         if factors.get("confidence_factor", 0) >= 7:
-            reason += f"✓ High confidence ({incident.confidence_score:.2f})\n"
+            parts.append(f"✓ High confidence ({incident.confidence_score:.2f})\n")
         elif factors.get("confidence_factor", 0) < 5:
-            reason += f"⚠ Low confidence ({incident.confidence_score:.2f})\n"
+            parts.append(f"⚠ Low confidence ({incident.confidence_score:.2f})\n")
         
         if factors.get("sentiment_factor", 0) >= 6:
-            reason += f"✓ Negative sentiment indicates threat ({incident.sentiment_score:.2f})\n"
+            parts.append(f"✓ Negative sentiment indicates threat ({incident.sentiment_score:.2f})\n")
         elif factors.get("sentiment_factor", 0) < 4:
-            reason += f"⚠ Positive/neutral sentiment ({incident.sentiment_score:.2f})\n"
+            parts.append(f"⚠ Positive/neutral sentiment ({incident.sentiment_score:.2f})\n")
         
         if factors.get("source_factor", 0) >= 7:
-            reason += f"✓ Reliable source type\n"
+            parts.append(_RELIABLE_SOURCE)
         elif factors.get("source_factor", 0) < 5:
-            reason += f"⚠ Lower reliability source\n"
+            parts.append(_UNRELIABLE_SOURCE)
         
         if factors.get("keyword_factor", 0) >= 6:
-            reason += f"✓ Strong keyword matches ({len(incident.keywords)} keywords)\n"
+            parts.append(f"✓ Strong keyword matches ({len(incident.keywords)} keywords)\n")
         elif factors.get("keyword_factor", 0) < 4:
-            reason += f"⚠ Limited keyword matches ({len(incident.keywords)} keywords)\n"
+            parts.append(f"⚠ Limited keyword matches ({len(incident.keywords)} keywords)\n")
         
         if factors.get("pattern_factor", 0) >= 7:
-            reason += f"✓ Similar recent incidents detected (escalating pattern)\n"
+            parts.append(_ESCALATING_PATTERN)
         elif factors.get("pattern_factor", 0) < 4:
-            reason += f"⚠ No recent similar incidents\n"
+            parts.append(_NO_PATTERN)
         
-        reason += f"\nSeverity: {incident.severity.value.upper()}"
-        reason += f"\nKeywords: {', '.join(incident.keywords)}"
+        parts.append(f"\nSeverity: {incident.severity.value.upper()}")
+        parts.append(f"\nKeywords: {', '.join(incident.keywords)}")
         
-        return reason
+        return "".join(parts)
     
     async def bulk_evaluate_incidents(
         self, 
         incidents: List[Incident],
-        historical_incidents: Optional[List[Incident]] = None
-    ) -> List[Tuple[Incident, bool, float, str]]:
-        """Evaluate multiple incidents for threat confirmation."""
+        historical_incidents: Optional[List[Incident]] = None,
+        defer_reasons: bool = False
+    ) -> List[Tuple[Incident, bool, float, Union[str, Callable[[], str]]]]:
+        """
+        Evaluate multiple incidents for threat confirmation.
         
-        results = []
-        for incident in incidents:
-            confirmed, score, reason = await self.evaluate_incident(
-                incident, None, historical_incidents
+        Args:
+            defer_reasons: Return zero-argument callables that build each
+                reason on demand, for callers that only show a few of them
+        """
+        if not incidents:
+            return []
+        
+        # One recent-history window for the whole batch
+        cutoff_time = self._recent_cutoff()
+        
+        try:
+            scores, factor_arrays = self._calculate_confirmation_scores(
+                incidents, historical_incidents, cutoff_time
             )
+        except Exception as e:
+            # Fall back to per-incident evaluation so one bad incident
+            # only fails itself
+            self.logger.warning(f"Batch threat evaluation failed, evaluating individually: {e}")
+            results = []
+            for incident in incidents:
+                confirmed, score, reason = await self.evaluate_incident(
+                    incident, None, historical_incidents, defer_reasons, cutoff_time
+                )
+                results.append((incident, confirmed, score, reason))
+            return results
+        
+        confirmed_flags = (scores >= self.criteria.min_risk_score).tolist()
+        
+        # Plain Python floats per factor, converted once per column
+        factor_names = list(factor_arrays)
+        factor_rows = zip(*(values.tolist() for values in factor_arrays.values()))
+        
+        results = []
+        for incident, confirmed, row in zip(incidents, confirmed_flags, factor_rows):
+            factors = dict(zip(factor_names, row))
+            score = factors["final_score"]
+            if defer_reasons:
+                reason = partial(self._generate_confirmation_reason, incident, score, factors, confirmed)
+            else:
+                reason = self._generate_confirmation_reason(incident, score, factors, confirmed)
             results.append((incident, confirmed, score, reason))
         
+        self.logger.info(
+            f"Bulk threat evaluation: {len(incidents)} incidents, "
+            f"{sum(confirmed_flags)} confirmed"
+        )
+        
         return results
     
+    def _calculate_confirmation_scores(
+        self,
+        incidents: List[Incident],
+        historical_incidents: Optional[List[Incident]],
+        cutoff_time: datetime
+    ) -> Tuple[np.ndarray, Dict[str, np.ndarray]]:
+        """
+        Vectorized _calculate_confirmation_score over a batch of incidents
+        without risk assessments.
+        
+        Returns:
+            Tuple of (final scores, factor name -> per-incident values)
+        """
+        criteria = self.criteria
+        
+        risk_scores = np.array([incident.risk_score for incident in incidents], dtype=float)
+        confidence_scores = np.array([incident.confidence_score for incident in incidents], dtype=float)
+        sentiment_scores = np.array([incident.sentiment_score for incident in incidents], dtype=float)
+        url_counts = np.array([len(incident.source_urls) for incident in incidents])
+        keyword_counts = np.array([len(incident.keywords) for incident in incidents])
+        
+        # One small-int code per incident, then a single array gather
+        source_codes, weight_table = self._source_weight_table()
+        unknown_code = len(weight_table) - 1
+        codes = np.fromiter(
+            (
+                source_codes.get(incident.incident_metadata.get("source_type", "other"), unknown_code)
+                for incident in incidents
+            ),
+            dtype=np.intp,
+            count=len(incidents)
+        )
+        source_weights = weight_table[codes]
+        
+        # Same branches as the scalar _evaluate_* methods
+        confidence_factor = np.where(
+            confidence_scores >= criteria.min_confidence_score,
+            confidence_scores * 10,
+            confidence_scores * 5
+        )
+        
+        sentiment_factor = np.select(
+            [
+                sentiment_scores <= criteria.max_negative_sentiment,
+                sentiment_scores < 0,
+                sentiment_scores < 0.3
+            ],
+            [
+                np.abs(sentiment_scores) * 8,
+                np.abs(sentiment_scores) * 5,
+                3.0
+            ],
+            default=np.maximum(1.0, 3.0 - sentiment_scores * 2)
+        )
+        
+        source_factor = np.minimum(
+            10.0, source_weights * 10 * np.where(url_counts > 1, 1.2, 1.0)
+        )
+        
+        keyword_factor = np.where(
+            keyword_counts >= criteria.min_keyword_matches,
+            np.minimum(10.0, keyword_counts * 2),
+            keyword_counts * 1.5
+        )
+        
+        pattern_factor = self._evaluate_historical_patterns_batch(
+            incidents, historical_incidents, cutoff_time
+        )
+        
+        assessment_factor = np.full(len(incidents), self._evaluate_risk_assessment(None))
+        
+        final_scores = (
+            risk_scores * 0.3 +
+            confidence_factor * 0.15 +
+            sentiment_factor * 0.15 +
+            source_factor * 0.15 +
+            keyword_factor * 0.10 +
+            pattern_factor * 0.10 +
+            assessment_factor * 0.05
+        )
+        
+        factor_arrays = {
+            "base_risk_score": risk_scores,
+            "confidence_factor": confidence_factor,
+            "sentiment_factor": sentiment_factor,
+            "source_factor": source_factor,
+            "keyword_factor": keyword_factor,
+            "pattern_factor": pattern_factor,
+            "assessment_factor": assessment_factor,
+            "final_score": final_scores
+        }
+        
+        return final_scores, factor_arrays
+    
+    def _evaluate_historical_patterns_batch(
+        self,
+        incidents: List[Incident],
+        historical_incidents: Optional[List[Incident]],
+        cutoff_time: datetime
+    ) -> np.ndarray:
+        """Vectorized _evaluate_historical_patterns over a batch of incidents."""
+        if not historical_incidents:
+            return np.full(len(incidents), 5.0)
+        
+        # Apply the time window once for the whole batch
+        recent_incidents = [
+            hist_incident for hist_incident in historical_incidents
+            if hist_incident.created_at >= cutoff_time
+        ]
+        if not recent_incidents:
+            return np.full(len(incidents), 5.0)
+        
+        # Give every recent keyword a bit; keyword overlap becomes a single
+        # AND of two integer masks instead of a set intersection
+        vocabulary: Dict[str, int] = {}
+        historical_masks = []
+        for hist_incident in recent_incidents:
+            mask = 0
+            for keyword in hist_incident.keywords:
+                mask |= 1 << vocabulary.setdefault(keyword, len(vocabulary))
+            historical_masks.append(mask)
+        
+        # Machine words while the vocabulary fits, Python ints beyond that
+        mask_dtype = np.uint64 if len(vocabulary) <= 64 else object
+        historical_masks = np.array(historical_masks, dtype=mask_dtype)
+        historical_risk_scores = np.array(
+            [hist_incident.risk_score for hist_incident in recent_incidents], dtype=float
+        )
+        
+        incident_masks = []
+        for incident in incidents:
+            incident_mask = 0
+            for keyword in incident.keywords:
+                bit = vocabulary.get(keyword)
+                if bit is not None:
+                    incident_mask |= 1 << bit
+            incident_masks.append(incident_mask)
+        
+        return pattern_factors(
+            np.array(incident_masks, dtype=mask_dtype),
+            historical_masks,
+            historical_risk_scores,
+            self.criteria.escalation_factor
+        )
+    
+    def _source_weight_table(self) -> Tuple[Dict[str, int], np.ndarray]:
+        """
+        Get the source type weight lookup used by the batch path.
+        
+        Returns:
+            Tuple of (source type -> code, weights indexed by code); the last
+            code is reserved for unknown source types
+        """
+        weights = self.criteria.source_type_weights
+        if weights is DEFAULT_SOURCE_TYPE_WEIGHTS:
+            return _DEFAULT_SOURCE_WEIGHT_TABLE
+        return _build_source_weight_table(weights)
+    
     def update_criteria(self, new_criteria: ConfirmationCriteria):
         """Update confirmation criteria."""
         self.criteria = new_criteria
@@ -318,11 +571,9 @@ class ThreatConfirmer:
         
         total = len(self.recent_confirmations)
         avg_risk = sum(inc.risk_score for inc in self.recent_confirmations) / total
-        severity_counts = {}
-        
-        for incident in self.recent_confirmations:
-            severity = incident.severity.value
-            severity_counts[severity] = severity_counts.get(severity, 0) + 1
+        severity_counts = dict(Counter(
+            incident.severity.value for incident in self.recent_confirmations
+        ))
         
         return {
             "total_confirmations": total,
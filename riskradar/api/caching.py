@@ -0,0 +1,210 @@
+"""
+In-process response caching for frequently polled API endpoints.
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+from fastapi import Request, Response
+from .responses import DefaultJSONResponse
+
+
+class TTLCache:
+    """
+    Small thread-safe cache whose entries expire a set time after they are stored.
+    
+    Write endpoints call ``invalidate`` after changing the data that cached
+    responses summarize, so readers never wait out a full TTL for their own
+    changes.
+    """
+    
+    def __init__(self, ttl_seconds: float, maxsize: int = 64):
+        """
+        Initialize the cache.
+        
+        Args:
+            ttl_seconds: How long an entry stays valid
+            maxsize: Maximum number of entries kept at once
+        """
+        self.ttl_seconds = ttl_seconds
+        self.maxsize = maxsize
+        self._entries: Dict[Hashable, Tuple[float, Any]] = {}
+        self._lock = threading.Lock()
+        # Bumped by invalidate, so values computed before it are not stored
+        self._generation = 0
+    
+    def get(self, key: Hashable) -> Optional[Any]:
+        """Get the value stored under key, or None if missing or expired."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            
+            expires_at, value = entry
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                return None
+            
+            return value
+    
+    @property
+    def generation(self) -> int:
+        """Number of invalidations so far."""
+        with self._lock:
+            return self._generation
+    
+    def set(
+        self,
+        key: Hashable,
+        value: Any,
+        ttl_seconds: Optional[float] = None,
+        generation: Optional[int] = None
+    ):
+        """
+        Store a value under key for ttl_seconds, or the cache TTL if not given.
+        
+        If generation is given and the cache has been invalidated since it was
+        read, the value may predate the invalidating write and is not stored.
+        """
+        if ttl_seconds is None:
+            ttl_seconds = self.ttl_seconds
+        now = time.monotonic()
+        with self._lock:
+            if generation is not None and generation != self._generation:
+                return
+            
+            if key not in self._entries and len(self._entries) >= self.maxsize:
+                # Drop expired entries first, then the one closest to expiry
+                self._entries = {
+                    k: entry for k, entry in self._entries.items() if entry[0] > now
+                }
+                if len(self._entries) >= self.maxsize:
+                    oldest = min(self._entries, key=lambda k: self._entries[k][0])
+                    del self._entries[oldest]
+            
+            self._entries[key] = (now + ttl_seconds, value)
+    
+    def get_or_compute(
+        self,
+        key: Hashable,
+        compute: Callable[[], Any],
+        ttl_seconds: Optional[float] = None
+    ) -> Any:
+        """
+        Get the value stored under key, computing and storing it on a miss.
+        
+        The computation runs outside the lock; concurrent misses may both
+        compute, and the last result wins. A result is returned but not
+        stored if the cache was invalidated while it was being computed.
+        """
+        value = self.get(key)
+        if value is None:
+            generation = self.generation
+            value = compute()
+            self.set(key, value, ttl_seconds, generation)
+        return value
+    
+    def invalidate(self):
+        """Drop every cached entry."""
+        with self._lock:
+            self._entries.clear()
+            self._generation += 1
+
+
+# Seconds a cached summary is served. Invalidation only clears the cache of
+# the process that handled the write, so with several API workers the others
+# can serve summaries up to this old.
+RESPONSE_CACHE_TTL = float(os.getenv("RISKRADAR_RESPONSE_CACHE_TTL", "5"))
+
+# Dashboard, threat and system summaries; invalidated by endpoints that
+# change incidents or sources
+dashboard_cache = TTLCache(ttl_seconds=RESPONSE_CACHE_TTL)
+
+# Client/proxy caching for responses that only change with a deploy
+STATIC_CACHE_CONTROL = "public, max-age=300"
+
+
+def make_etag(payload: Any, weak: bool = False) -> str:
+    """
+    Build an ETag from the JSON form of a response payload.
+    
+    Weak ETags suit responses that also carry fields, such as timestamps,
+    that change without changing the payload's meaning.
+    """
+    body = json.dumps(payload, sort_keys=True, default=str).encode()
+    etag = '"%s"' % hashlib.blake2b(body, digest_size=8).hexdigest()
+    return f"W/{etag}" if weak else etag
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """Check whether the request's If-None-Match header covers the ETag."""
+    if_none_match = request.headers.get("if-none-match")
+    if not if_none_match:
+        return False
+    
+    # If-None-Match uses weak comparison: W/ prefixes are ignored on both sides
+    opaque = etag[2:] if etag.startswith("W/") else etag
+    candidates = [candidate.strip() for candidate in if_none_match.split(",")]
+    return "*" in candidates or opaque in candidates or f"W/{opaque}" in candidates
+
+
+def cached_json_response(
+    request: Request,
+    cache: TTLCache,
+    key: Hashable,
+    build: Callable[[], Any],
+    cache_control: Optional[str] = None,
+    ttl_seconds: Optional[float] = None
+) -> Response:
+    """
+    Serve a JSON payload from the cache, answering 304 when the client's copy is current.
+    
+    Args:
+        request: Incoming request, checked for If-None-Match
+        cache: Cache holding (payload, etag) pairs
+        key: Cache key for this response
+        build: Computes the payload on a cache miss
+        cache_control: Optional Cache-Control header value
+        ttl_seconds: How long to keep the payload, if not the cache's default
+    
+    Returns:
+        A 304 response or a JSON response carrying the payload
+    """
+    def compute():
+        payload = build()
+        return payload, make_etag(payload)
+    
+    payload, etag = cache.get_or_compute(key, compute, ttl_seconds)
+    return conditional_json_response(request, payload, etag, cache_control)
+
+
+def conditional_json_response(
+    request: Request,
+    payload: Any,
+    etag: str,
+    cache_control: Optional[str] = None
+) -> Response:
+    """
+    Send a JSON payload with its ETag, or 304 when the client's copy is current.
+    
+    Args:
+        request: Incoming request, checked for If-None-Match
+        payload: Response payload
+        etag: ETag identifying the payload
+        cache_control: Optional Cache-Control header value
+    
+    Returns:
+        A 304 response or a JSON response carrying the payload
+    """
+    headers = {"ETag": etag}
+    if cache_control:
+        headers["Cache-Control"] = cache_control
+    
+    if etag_matches(request, etag):
+        return Response(status_code=304, headers=headers)
+    
+    return DefaultJSONResponse(content=payload, headers=headers)
@@ -0,0 +1,72 @@
+"""
+Logging filters for the API process.
+"""
+
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Hashable, List
+
+
+class RateLimitingFilter(logging.Filter):
+    """
+    Drop repeats of the same warning or error beyond a burst per time window.
+    
+    Records are grouped by logger, level and message template (the format
+    string before %-arguments are applied), so a failing endpoint logging the
+    same error on every request is written ``burst`` times per ``period``; the
+    first record of the next window reports how many were dropped. Records
+    below ``min_level`` always pass.
+    """
+    
+    def __init__(self, burst: int = 10, period: float = 60.0,
+                 min_level: int = logging.WARNING, max_keys: int = 1000):
+        """
+        Initialize the filter.
+        
+        Args:
+            burst: Records passed per key in each window
+            period: Window length in seconds
+            min_level: Lowest level that is rate limited
+            max_keys: Most keys tracked; the oldest window is forgotten beyond this
+        """
+        super().__init__()
+        self.burst = burst
+        self.period = period
+        self.min_level = min_level
+        self.max_keys = max_keys
+        # key -> [window start, records passed, records dropped], ordered by
+        # window start so the oldest window is always first
+        self._windows: "OrderedDict[Hashable, List[float]]" = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno < self.min_level:
+            return True
+        
+        key = (record.name, record.levelno, str(record.msg))
+        now = time.monotonic()
+        
+        with self._lock:
+            window = self._windows.get(key)
+            if window is None or now - window[0] >= self.period:
+                if window is None:
+                    while len(self._windows) >= self.max_keys:
+                        self._windows.popitem(last=False)
+                    dropped = 0
+                else:
+                    self._windows.move_to_end(key)
+                    dropped = int(window[2])
+                
+                self._windows[key] = [now, 1, 0]
+                if dropped:
+                    record.msg = f"{record.msg} ({dropped} similar messages suppressed)"
+                return True
+            
+            if window[1] < self.burst:
+                window[1] += 1
+                return True
+            
+            window[2] += 1
+            return False
@@ -7,15 +7,23 @@ from fastapi.staticfiles import StaticFiles
 from fastapi.templating import Jinja2Templates
 from fastapi.responses import HTMLResponse
 from sqlalchemy.orm import Session
+from sqlalchemy import func, select
+import asyncio
 import logging
 from pathlib import Path
 
-from ..core.database import get_db, init_database, check_database_health
+from ..core.database import db_manager, get_db, init_database, check_database_health
 from .routers import sources, threats, dashboard, scraping, system, topic_analysis
 from ..core.models import DataSourceORM, IncidentORM
+from .caching import dashboard_cache
+from .responses import DefaultJSONResponse
+from .log_filters import RateLimitingFilter
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
+for handler in logging.getLogger().handlers:
+    # Keep a failing endpoint from flooding the log with the same error
+    handler.addFilter(RateLimitingFilter())
 logger = logging.getLogger(__name__)
 
 # Create FastAPI app
@@ -24,7 +32,8 @@ app = FastAPI(
     description="Early warning system for emerging threats",
     version="1.0.0",
     docs_url="/api/docs",
-    redoc_url="/api/redoc"
+    redoc_url="/api/redoc",
+    default_response_class=DefaultJSONResponse
 )
 
 # Setup templates and static files
@@ -63,42 +72,65 @@ async def startup_event():
             logger.error("Database health check failed!")
             raise Exception("Database not accessible")
         
+        # Connect ahead of the first dashboard burst rather than during it
+        db_manager.warm_pool()
+        
+        # Keep host resource usage sampled for the health and metrics endpoints
+        app.state.resource_sampler_task = asyncio.create_task(system.resource_sampler.run())
+        
         logger.info("RiskRadar startup completed successfully")
         
     except Exception as e:
-        logger.error(f"Startup failed: {e}")
+        logger.error("Startup failed: %s", e)
         raise
 
 @app.on_event("shutdown")
 async def shutdown_event():
     """Cleanup on shutdown."""
     logger.info("Shutting down RiskRadar...")
+    sampler_task = getattr(app.state, "resource_sampler_task", None)
+    if sampler_task is not None:
+        sampler_task.cancel()
+    scraping.scraping_executor.shutdown(wait=False)
+    system.health_executor.shutdown(wait=False)
+    scraping.scraping_manager.close()
+
+def _dashboard_page_stats(db: Session) -> dict:
+    """All-time source and incident counts for the dashboard page, in one query."""
+    total_sources_query = select(func.count()).select_from(DataSourceORM).scalar_subquery()
+    active_sources_query = select(func.count()).select_from(DataSourceORM).where(
+        DataSourceORM.enabled == True
+    ).scalar_subquery()
+    
+    counts = db.query(
+        total_sources_query.label("total_sources"),
+        active_sources_query.label("active_sources"),
+        func.count().label("total_incidents"),
+        func.count().filter(IncidentORM.status == "confirmed").label("confirmed_threats")
+    ).select_from(IncidentORM).one()
+    
+    return {
+        "total_sources": counts.total_sources,
+        "active_sources": counts.active_sources,
+        "total_incidents": counts.total_incidents,
+        "confirmed_threats": counts.confirmed_threats,
+        "threat_rate": round((counts.confirmed_threats / max(1, counts.total_incidents)) * 100, 1)
+    }
 
 # Web Interface Routes
 @app.get("/", response_class=HTMLResponse)
 async def dashboard_page(request: Request, db: Session = Depends(get_db)):
     """Main dashboard page."""
     try:
-        # Get dashboard statistics
-        total_sources = db.query(DataSourceORM).count()
-        active_sources = db.query(DataSourceORM).filter(DataSourceORM.enabled == True).count()
-        total_incidents = db.query(IncidentORM).count()
-        confirmed_threats = db.query(IncidentORM).filter(IncidentORM.status == "confirmed").count()
-        
-        stats = {
-            "total_sources": total_sources,
-            "active_sources": active_sources,
-            "total_incidents": total_incidents,
-            "confirmed_threats": confirmed_threats,
-            "threat_rate": round((confirmed_threats / max(1, total_incidents)) * 100, 1)
-        }
+        # Get dashboard statistics, shared with the dashboard API cache
+        stats = dashboard_cache.get_or_compute("page_stats", lambda: _dashboard_page_stats(db))
         
         return templates.TemplateResponse(
             "dashboard.html", 
             {"request": request, "stats": stats}
         )
     except Exception as e:
-        logger.error(f"Dashboard error: {e}")
+        logger.error("Dashboard error: %s", e)
         return templates.TemplateResponse(
             "error.html", 
             {"request": request, "error": str(e)}
@@ -143,7 +175,7 @@ async def not_found_handler(request: Request, exc: HTTPException):
 @app.exception_handler(500)
 async def server_error_handler(request: Request, exc: Exception):
     """Handle 500 errors."""
-    logger.error(f"Server error: {exc}")
+    logger.error("Server error: %s", exc)
     return templates.TemplateResponse(
         "error.html",
         {"request": request, "error": "Internal server error", "status_code": 500},
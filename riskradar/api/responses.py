@@ -0,0 +1,11 @@
+"""
+JSON response class used by the API.
+"""
+
+from fastapi.responses import JSONResponse
+
+try:
+    import orjson  # noqa: F401 - ORJSONResponse needs it at render time
+    from fastapi.responses import ORJSONResponse as DefaultJSONResponse
+except ImportError:
+    DefaultJSONResponse = JSONResponse
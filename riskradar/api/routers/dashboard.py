@@ -2,222 +2,257 @@
 API router for dashboard endpoints.
 """
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request
 from sqlalchemy.orm import Session
-from sqlalchemy import desc, and_
+from sqlalchemy import desc, and_, func, select
 from typing import Dict, Any
 from datetime import datetime, timedelta
 import logging
 
 from ...core.database import get_db
 from ...core.models import IncidentORM, DataSourceORM
+from ..caching import cached_json_response, dashboard_cache
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
 
 @router.get("/overview")
-async def get_dashboard_overview(db: Session = Depends(get_db)):
+async def get_dashboard_overview(request: Request, db: Session = Depends(get_db)):
     """Get dashboard overview statistics."""
     try:
-        # Source statistics
-        total_sources = db.query(DataSourceORM).count()
-        active_sources = db.query(DataSourceORM).filter(DataSourceORM.enabled == True).count()
-        
-        # Incident statistics (last 30 days)
-        cutoff_date = datetime.utcnow() - timedelta(days=30)
-        
-        total_incidents = db.query(IncidentORM).filter(
-            IncidentORM.created_at >= cutoff_date
-        ).count()
-        
-        confirmed_threats = db.query(IncidentORM).filter(
-            and_(
-                IncidentORM.created_at >= cutoff_date,
-                IncidentORM.status == "confirmed"
-            )
-        ).count()
-        
-        pending_threats = db.query(IncidentORM).filter(
-            and_(
-                IncidentORM.created_at >= cutoff_date,
-                IncidentORM.status == "pending"
-            )
-        ).count()
-        
-        high_risk_threats = db.query(IncidentORM).filter(
-            and_(
-                IncidentORM.created_at >= cutoff_date,
-                IncidentORM.risk_score >= 7.0
-            )
-        ).count()
-        
-        # Recent activity
-        recent_threats = db.query(IncidentORM).filter(
-            IncidentORM.created_at >= cutoff_date
-        ).order_by(desc(IncidentORM.created_at)).limit(5).all()
-        
-        # Calculate threat rate
-        threat_rate = round((confirmed_threats / max(1, total_incidents)) * 100, 1)
-        
-        return {
-            "sources": {
-                "total": total_sources,
-                "active": active_sources,
-                "inactive": total_sources - active_sources,
-                "health_percentage": round((active_sources / max(1, total_sources)) * 100, 1)
-            },
-            "threats": {
-                "total_incidents": total_incidents,
-                "confirmed_threats": confirmed_threats,
-                "pending_threats": pending_threats,
-                "high_risk_threats": high_risk_threats,
-                "threat_rate": threat_rate
-            },
-            "recent_activity": [
-                {
-                    "id": threat.id,
-                    "title": threat.title[:80] + "..." if len(threat.title) > 80 else threat.title,
-                    "severity": threat.severity,
-                    "risk_score": threat.risk_score,
-                    "status": threat.status,
-                    "created_at": threat.created_at.isoformat()
-                }
-                for threat in recent_threats
-            ],
-            "period": "Last 30 days",
-            "last_updated": datetime.utcnow().isoformat()
-        }
+        return cached_json_response(
+            request, dashboard_cache, "overview", lambda: _build_overview(db)
+        )
         
     except Exception as e:
-        logger.error(f"Error fetching dashboard overview: {e}")
+        logger.error("Error fetching dashboard overview: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
 
+def _build_overview(db: Session) -> Dict[str, Any]:
+    """Compute the dashboard overview statistics."""
+    # Incident statistics (last 30 days)
+    cutoff_date = datetime.utcnow() - timedelta(days=30)
+    
+    # Source and incident counts in a single round trip
+    total_sources_query = select(func.count()).select_from(DataSourceORM).scalar_subquery()
+    active_sources_query = select(func.count()).select_from(DataSourceORM).where(
+        DataSourceORM.enabled == True
+    ).scalar_subquery()
+    
+    counts = db.query(
+        total_sources_query.label("total_sources"),
+        active_sources_query.label("active_sources"),
+        func.count().label("total_incidents"),
+        func.count().filter(IncidentORM.status == "confirmed").label("confirmed_threats"),
+        func.count().filter(IncidentORM.status == "pending").label("pending_threats"),
+        func.count().filter(IncidentORM.risk_score >= 7.0).label("high_risk_threats")
+    ).select_from(IncidentORM).filter(
+        IncidentORM.created_at >= cutoff_date
+    ).one()
+    
+    total_sources = counts.total_sources
+    active_sources = counts.active_sources
+    total_incidents = counts.total_incidents
+    confirmed_threats = counts.confirmed_threats
+    pending_threats = counts.pending_threats
+    high_risk_threats = counts.high_risk_threats
+    
+    # Recent activity; titles are cut down by the database, one character
+    # past the display limit so truncation can still be detected
+    recent_threats = db.query(
+        IncidentORM.id,
+        func.substr(IncidentORM.title, 1, 81).label("title"),
+        IncidentORM.severity,
+        IncidentORM.risk_score,
+        IncidentORM.status,
+        IncidentORM.created_at
+    ).filter(
+        IncidentORM.created_at >= cutoff_date
+    ).order_by(desc(IncidentORM.created_at)).limit(5).all()
+    
+    # Calculate threat rate
+    threat_rate = round((confirmed_threats / max(1, total_incidents)) * 100, 1)
+    
+    return {
+        "sources": {
+            "total": total_sources,
+            "active": active_sources,
+            "inactive": total_sources - active_sources,
+            "health_percentage": round((active_sources / max(1, total_sources)) * 100, 1)
+        },
+        "threats": {
+            "total_incidents": total_incidents,
+            "confirmed_threats": confirmed_threats,
+            "pending_threats": pending_threats,
+            "high_risk_threats": high_risk_threats,
+            "threat_rate": threat_rate
+        },
+        "recent_activity": [
+            {
+                "id": threat.id,
+                "title": threat.title[:80] + "..." if len(threat.title) > 80 else threat.title,
+                "severity": threat.severity,
+                "risk_score": threat.risk_score,
+                "status": threat.status,
+                "created_at": threat.created_at.isoformat()
+            }
+            for threat in recent_threats
+        ],
+        "period": "Last 30 days",
+        "last_updated": datetime.utcnow().isoformat()
+    }
+
 @router.get("/alerts")
-async def get_dashboard_alerts(db: Session = Depends(get_db)):
+async def get_dashboard_alerts(request: Request, db: Session = Depends(get_db)):
     """Get current system alerts and notifications."""
     try:
-        alerts = []
-        
-        # Check for inactive sources
-        inactive_sources = db.query(DataSourceORM).filter(DataSourceORM.enabled == False).count()
-        if inactive_sources > 0:
-            alerts.append({
-                "type": "warning",
-                "title": "Inactive Sources",
-                "message": f"{inactive_sources} sources are currently disabled",
-                "action": "Review source configuration",
-                "link": "/sources"
-            })
-        
-        # Check for high-risk threats in last 24 hours
-        cutoff_24h = datetime.utcnow() - timedelta(hours=24)
-        high_risk_recent = db.query(IncidentORM).filter(
-            and_(
-                IncidentORM.created_at >= cutoff_24h,
-                IncidentORM.risk_score >= 8.0,
-                IncidentORM.status == "pending"
-            )
-        ).count()
-        
-        if high_risk_recent > 0:
-            alerts.append({
-                "type": "critical",
-                "title": "High-Risk Threats Detected",
-                "message": f"{high_risk_recent} high-risk threats require attention",
-                "action": "Review pending threats",
-                "link": "/threats?status=pending&severity=high"
-            })
-        
-        # Check for system health
-        total_sources = db.query(DataSourceORM).count()
-        if total_sources == 0:
-            alerts.append({
-                "type": "error",
-                "title": "No Sources Configured",
-                "message": "No monitoring sources are configured",
-                "action": "Configure sources",
-                "link": "/sources"
-            })
-        
-        return {
-            "alerts": alerts,
-            "alert_count": len(alerts),
-            "last_checked": datetime.utcnow().isoformat()
-        }
+        return cached_json_response(
+            request, dashboard_cache, "alerts", lambda: _build_alerts(db)
+        )
         
     except Exception as e:
-        logger.error(f"Error fetching dashboard alerts: {e}")
+        logger.error("Error fetching dashboard alerts: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
 
+def _build_alerts(db: Session) -> Dict[str, Any]:
+    """Compute the current system alerts."""
+    alerts = []
+    
+    # Check for inactive sources
+    inactive_sources = db.query(func.count(DataSourceORM.id)).filter(
+        DataSourceORM.enabled == False
+    ).scalar()
+    if inactive_sources > 0:
+        alerts.append({
+            "type": "warning",
+            "title": "Inactive Sources",
+            "message": f"{inactive_sources} sources are currently disabled",
+            "action": "Review source configuration",
+            "link": "/sources"
+        })
+    
+    # Check for high-risk threats in last 24 hours
+    cutoff_24h = datetime.utcnow() - timedelta(hours=24)
+    high_risk_recent = db.query(func.count(IncidentORM.id)).filter(
+        and_(
+            IncidentORM.created_at >= cutoff_24h,
+            IncidentORM.risk_score >= 8.0,
+            IncidentORM.status == "pending"
+        )
+    ).scalar()
+    
+    if high_risk_recent > 0:
+        alerts.append({
+            "type": "critical",
+            "title": "High-Risk Threats Detected",
+            "message": f"{high_risk_recent} high-risk threats require attention",
+            "action": "Review pending threats",
+            "link": "/threats?status=pending&severity=high"
+        })
+    
+    # Check for system health
+    total_sources = db.query(func.count(DataSourceORM.id)).scalar()
+    if total_sources == 0:
+        alerts.append({
+            "type": "error",
+            "title": "No Sources Configured",
+            "message": "No monitoring sources are configured",
+            "action": "Configure sources",
+            "link": "/sources"
+        })
+    
+    return {
+        "alerts": alerts,
+        "alert_count": len(alerts),
+        "last_checked": datetime.utcnow().isoformat()
+    }
+
 @router.get("/metrics")
 async def get_dashboard_metrics(
+    request: Request,
     days_back: int = 7,
     db: Session = Depends(get_db)
 ):
     """Get dashboard metrics for charts and graphs."""
     try:
-        cutoff_date = datetime.utcnow() - timedelta(days=days_back)
-        
-        # Daily incident counts
-        incidents = db.query(IncidentORM).filter(
-            IncidentORM.created_at >= cutoff_date
-        ).order_by(IncidentORM.created_at).all()
-        
-        # Group by date
-        daily_metrics = {}
-        for i in range(days_back):
-            date = (datetime.utcnow() - timedelta(days=i)).date()
-            daily_metrics[date.isoformat()] = {
-                "date": date.isoformat(),
-                "incidents": 0,
-                "confirmed": 0,
-                "high_risk": 0,
-                "avg_risk_score": 0
-            }
-        
-        # Populate with actual data
-        risk_scores_by_date = {}
-        for incident in incidents:
-            date_key = incident.created_at.date().isoformat()
-            if date_key in daily_metrics:
-                daily_metrics[date_key]["incidents"] += 1
-                
-                if incident.status == "confirmed":
-                    daily_metrics[date_key]["confirmed"] += 1
-                
-                if incident.risk_score >= 7.0:
-                    daily_metrics[date_key]["high_risk"] += 1
-                
-                if date_key not in risk_scores_by_date:
-                    risk_scores_by_date[date_key] = []
-                risk_scores_by_date[date_key].append(incident.risk_score)
-        
-        # Calculate average risk scores
-        for date_key, scores in risk_scores_by_date.items():
-            if scores:
-                daily_metrics[date_key]["avg_risk_score"] = round(sum(scores) / len(scores), 2)
-        
-        # Severity distribution
-        severity_counts = {}
-        for incident in incidents:
-            severity = incident.severity
-            severity_counts[severity] = severity_counts.get(severity, 0) + 1
-        
-        # Source type distribution
-        source_type_counts = {}
-        for incident in incidents:
-            source_type = incident.incident_metadata.get("source_type", "unknown")
-            source_type_counts[source_type] = source_type_counts.get(source_type, 0) + 1
-        
-        return {
-            "period_days": days_back,
-            "daily_metrics": list(daily_metrics.values()),
-            "severity_distribution": severity_counts,
-            "source_type_distribution": source_type_counts,
-            "total_incidents": len(incidents),
-            "generated_at": datetime.utcnow().isoformat()
-        }
+        return cached_json_response(
+            request, dashboard_cache, ("metrics", days_back),
+            lambda: _build_metrics(db, days_back)
+        )
         
     except Exception as e:
-        logger.error(f"Error fetching dashboard metrics: {e}")
+        logger.error("Error fetching dashboard metrics: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
+
+def _build_metrics(db: Session, days_back: int) -> Dict[str, Any]:
+    """Compute the daily metrics and distributions for the last days_back days."""
+    cutoff_date = datetime.utcnow() - timedelta(days=days_back)
+    
+    # Daily incident counts, aggregated by the database
+    day = func.date(IncidentORM.created_at)
+    daily_rows = db.query(
+        day.label("day"),
+        func.count().label("incidents"),
+        func.count().filter(IncidentORM.status == "confirmed").label("confirmed"),
+        func.count().filter(IncidentORM.risk_score >= 7.0).label("high_risk"),
+        func.avg(IncidentORM.risk_score).label("avg_risk_score")
+    ).filter(
+        IncidentORM.created_at >= cutoff_date
+    ).group_by(day).all()
+    
+    # Group by date
+    today = datetime.utcnow().date()
+    daily_metrics = {}
+    for i in range(days_back):
+        date_key = (today - timedelta(days=i)).isoformat()
+        daily_metrics[date_key] = {
+            "date": date_key,
+            "incidents": 0,
+            "confirmed": 0,
+            "high_risk": 0,
+            "avg_risk_score": 0
+        }
+    
+    # Populate with actual data
+    total_incidents = 0
+    for row in daily_rows:
+        total_incidents += row.incidents
+        
+        # SQLite returns the day as text, PostgreSQL as a date
+        date_key = row.day if isinstance(row.day, str) else row.day.isoformat()
+        day_metrics = daily_metrics.get(date_key)
+        if day_metrics is not None:
+            day_metrics["incidents"] = row.incidents
+            day_metrics["confirmed"] = row.confirmed
+            day_metrics["high_risk"] = row.high_risk
+            day_metrics["avg_risk_score"] = round(row.avg_risk_score, 2)
+    
+    # Severity distribution, in order of first appearance
+    severity_rows = db.query(
+        IncidentORM.severity,
+        func.count()
+    ).filter(
+        IncidentORM.created_at >= cutoff_date
+    ).group_by(IncidentORM.severity).order_by(func.min(IncidentORM.created_at)).all()
+    severity_counts = dict(severity_rows)
+    
+    # Source type distribution, in order of first appearance
+    source_type_rows = db.query(
+        IncidentORM.source_type,
+        func.count()
+    ).filter(
+        IncidentORM.created_at >= cutoff_date
+    ).group_by(IncidentORM.source_type).order_by(func.min(IncidentORM.created_at)).all()
+    source_type_counts = {
+        (source_type if source_type is not None else "unknown"): count
+        for source_type, count in source_type_rows
+    }
+    
+    return {
+        "period_days": days_back,
+        "daily_metrics": list(daily_metrics.values()),
+        "severity_distribution": severity_counts,
+        "source_type_distribution": source_type_counts,
+        "total_incidents": total_incidents,
+        "generated_at": datetime.utcnow().isoformat()
+    }
@@ -2,12 +2,17 @@
 API endpoints for web scraping operations.
 """
 
-from fastapi import APIRouter, HTTPException, BackgroundTasks, Depends
+from fastapi import APIRouter, HTTPException, Depends, Request
+from concurrent.futures import ThreadPoolExecutor
+from threading import Lock
 from typing import List, Dict, Any, Optional
 from datetime import datetime
 import logging
+import uuid
 
 from ...scrapers.manager import ScrapingManager
+from ...workers import enqueue_scraping, get_job_status
+from ..caching import STATIC_CACHE_CONTROL, TTLCache, conditional_json_response, make_etag
 from ...core.database import get_db
 from ...core.models import DataSourceORM, SourceType
 from sqlalchemy.orm import Session
@@ -16,12 +21,79 @@ logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/api/scraping", tags=["scraping"])
 
+# Scraper types are fixed, so their descriptions are built once
+_SCRAPER_SOURCE_TYPES = {
+    "news": {
+        "label": "News Sources",
+        "description": "News websites and publications",
+        "scraper_class": "NewsScraper"
+    },
+    "government": {
+        "label": "Government Sources",
+        "description": "Government security advisories and alerts",
+        "scraper_class": "GovernmentScraper"
+    },
+    "social_media": {
+        "label": "Social Media",
+        "description": "Social media platforms and forums",
+        "scraper_class": "SocialScraper"
+    },
+    "blog": {
+        "label": "Security Blogs",
+        "description": "Security research and analysis blogs",
+        "scraper_class": "BlogScraper"
+    }
+}
+
+# Weak, since responses also carry a per-request timestamp
+_SCRAPER_SOURCE_TYPES_ETAG = make_etag(_SCRAPER_SOURCE_TYPES, weak=True)
+
 # Global scraping manager instance
 scraping_manager = ScrapingManager(max_workers=5)
 
+# In-process scrapes run here rather than in the request threadpool, so a
+# long scrape never holds threads that synchronous handlers need
+scraping_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="scraping")
+
+# Jobs run in this process when no worker queue is configured, oldest first.
+# They are only visible to this process: with several API workers, a status
+# request routed to another worker answers 404.
+_local_jobs: Dict[str, Dict[str, Any]] = {}
+_MAX_LOCAL_JOBS = 100
+_local_jobs_lock = Lock()
+
+def _record_local_job(job_id: str, state: str, **details):
+    """Record the state of an in-process scraping job."""
+    with _local_jobs_lock:
+        if job_id not in _local_jobs and len(_local_jobs) >= _MAX_LOCAL_JOBS:
+            del _local_jobs[next(iter(_local_jobs))]
+        
+        _local_jobs[job_id] = {"job_id": job_id, "state": state, **details}
+
+# Dashboards poll /status and /stats; share one manager snapshot per 250ms
+# instead of taking the manager's stats lock on every poll
+_status_cache = TTLCache(ttl_seconds=0.25, maxsize=1)
+
+def cached_scraping_status() -> Dict[str, Any]:
+    """Get the shared scraping manager's status, cached briefly."""
+    return _status_cache.get_or_compute("status", scraping_manager.get_scraping_status)
+
+def _source_to_config(source: DataSourceORM) -> Dict[str, Any]:
+    """Convert a stored source to the config dict the scraping manager expects."""
+    return {
+        "id": source.id,
+        "name": source.name,
+        "source_type": source.source_type,
+        "url_pattern": source.url_pattern,
+        "keywords": source.keywords or [],
+        "scraping_config": source.scraping_config or {},
+        "enabled": source.enabled,
+        # Not stored per source; scrapers fall back to the same default
+        "reliability_score": getattr(source, "reliability_score", 0.5)
+    }
+
 @router.post("/start")
-async def start_scraping(
-    background_tasks: BackgroundTasks,
+def start_scraping(
     source_ids: Optional[List[int]] = None,
     db: Session = Depends(get_db)
 ):
@@ -51,35 +123,33 @@ async def start_scraping(
             )
         
         # Convert to source configs
-        source_configs = []
-        for source in sources:
-            config = {
-                "id": source.id,
-                "name": source.name,
-                "source_type": source.source_type,
-                "url_pattern": source.url_pattern,
-                "keywords": source.keywords or [],
-                "scraping_config": source.scraping_config or {},
-                "enabled": source.enabled,
-                "reliability_score": source.reliability_score
-            }
-            source_configs.append(config)
+        source_configs = [_source_to_config(source) for source in sources]
         
-        # Start scraping in background
-        def run_scraping():
-            try:
-                results = scraping_manager.start_scraping(source_configs)
-                logger.info(f"Background scraping completed: {results}")
-                
-                # Store results in database
-                # TODO: Implement threat storage after analysis
-                
-            except Exception as e:
-                logger.error(f"Background scraping failed: {e}")
+        # Hand the job to the worker queue when one is configured
+        job_id = enqueue_scraping(source_configs)
         
-        background_tasks.add_task(run_scraping)
+        if job_id is None:
+            # No queue: scrape in this process, on the scraping executor
+            job_id = uuid.uuid4().hex
+            _record_local_job(job_id, "started")
+            
+            def run_scraping():
+                try:
+                    results = scraping_manager.start_scraping(source_configs)
+                    logger.info("Background scraping completed: %s", results)
+                    _record_local_job(job_id, "success", result=results)
+                    
+                    # Store results in database
+                    # TODO: Implement threat storage after analysis
+                
+                except Exception as e:
+                    logger.error("Background scraping failed: %s", e)
+                    _record_local_job(job_id, "failure", error=str(e))
+            
+            scraping_executor.submit(run_scraping)
         
         return {
+            "job_id": job_id,
             "status": "started",
             "message": f"Scraping started for {len(source_configs)} sources",
             "sources": [s["name"] for s in source_configs],
@@ -87,7 +157,7 @@ async def start_scraping(
         }
         
     except Exception as e:
-        logger.error(f"Failed to start scraping: {e}")
+        logger.error("Failed to start scraping: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.post("/stop")
@@ -100,6 +170,7 @@ async def stop_scraping():
     """
     try:
         result = scraping_manager.stop_scraping()
+        _status_cache.invalidate()
         
         return {
             "status": "stopped",
@@ -109,7 +180,7 @@ async def stop_scraping():
         }
         
     except Exception as e:
-        logger.error(f"Failed to stop scraping: {e}")
+        logger.error("Failed to stop scraping: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.get("/status")
@@ -121,7 +192,7 @@ async def get_scraping_status():
         dict: Current scraping status and stats
     """
     try:
-        status = scraping_manager.get_scraping_status()
+        status = cached_scraping_status()
         
         return {
             "status": status["status"],
@@ -131,11 +202,41 @@ async def get_scraping_status():
         }
         
     except Exception as e:
-        logger.error(f"Failed to get scraping status: {e}")
+        logger.error("Failed to get scraping status: %s", e)
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.get("/status/{job_id}")
+async def get_scraping_job_status(job_id: str):
+    """
+    Get the state of a scraping job started through /start.
+    
+    Without a worker queue, jobs are tracked in the API process that started
+    them and are only found when the request reaches that process.
+    
+    Args:
+        job_id: Job ID returned by /start
+    
+    Returns:
+        dict: Job state and, once finished, its result or error
+    """
+    try:
+        status = _local_jobs.get(job_id) or get_job_status(job_id)
+        if status is None:
+            raise HTTPException(status_code=404, detail="Scraping job not found")
+        
+        return {
+            **status,
+            "timestamp": datetime.utcnow().isoformat()
+        }
+    
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error("Failed to get scraping job %s: %s", job_id, e)
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.post("/test/{source_id}")
-async def test_single_source(
+def test_single_source(
     source_id: int,
     db: Session = Depends(get_db)
 ):
@@ -156,16 +257,7 @@ async def test_single_source(
             raise HTTPException(status_code=404, detail="Source not found")
         
         # Convert to source config
-        source_config = {
-            "id": source.id,
-            "name": source.name,
-            "source_type": source.source_type,
-            "url_pattern": source.url_pattern,
-            "keywords": source.keywords or [],
-            "scraping_config": source.scraping_config or {},
-            "enabled": source.enabled,
-            "reliability_score": source.reliability_score
-        }
+        source_config = _source_to_config(source)
         
         # Test scraping
         results = scraping_manager.scrape_single_source(source_config)
@@ -179,7 +271,7 @@ async def test_single_source(
         }
         
     except Exception as e:
-        logger.error(f"Failed to test source {source_id}: {e}")
+        logger.error("Failed to test source %s: %s", source_id, e)
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.post("/validate")
@@ -204,11 +296,11 @@ async def validate_source_config(source_config: Dict[str, Any]):
         }
         
     except Exception as e:
-        logger.error(f"Failed to validate source config: {e}")
+        logger.error("Failed to validate source config: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.get("/sources/types")
-async def get_source_types():
+async def get_source_types(request: Request):
     """
     Get available source types for scraping.
     
@@ -216,34 +308,18 @@ async def get_source_types():
         dict: Available source types and their descriptions
     """
     try:
-        return {
-            "source_types": {
-                "news": {
-                    "label": "News Sources",
-                    "description": "News websites and publications",
-                    "scraper_class": "NewsScraper"
-                },
-                "government": {
-                    "label": "Government Sources",
-                    "description": "Government security advisories and alerts",
-                    "scraper_class": "GovernmentScraper"
-                },
-                "social_media": {
-                    "label": "Social Media",
-                    "description": "Social media platforms and forums",
-                    "scraper_class": "SocialScraper"
-                },
-                "blog": {
-                    "label": "Security Blogs",
-                    "description": "Security research and analysis blogs",
-                    "scraper_class": "BlogScraper"
-                }
+        return conditional_json_response(
+            request,
+            {
+                "source_types": _SCRAPER_SOURCE_TYPES,
+                "timestamp": datetime.utcnow().isoformat()
             },
-            "timestamp": datetime.utcnow().isoformat()
-        }
+            _SCRAPER_SOURCE_TYPES_ETAG,
+            STATIC_CACHE_CONTROL
+        )
         
     except Exception as e:
-        logger.error(f"Failed to get source types: {e}")
+        logger.error("Failed to get source types: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.get("/stats")
@@ -255,7 +331,7 @@ async def get_scraping_statistics():
         dict: Comprehensive scraping statistics
     """
     try:
-        status = scraping_manager.get_scraping_status()
+        status = cached_scraping_status()
         stats = status["stats"]
         
         # Calculate additional metrics
@@ -285,5 +361,5 @@ async def get_scraping_statistics():
         }
         
     except Exception as e:
-        logger.error(f"Failed to get scraping statistics: {e}")
+        logger.error("Failed to get scraping statistics: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
@@ -2,19 +2,79 @@
 API router for source management endpoints.
 """
 
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
 from sqlalchemy.orm import Session
-from typing import List, Optional
+from sqlalchemy import func, select, update
+from sqlalchemy.exc import IntegrityError
+from typing import Any, Dict, List, Optional
 from pydantic import BaseModel, Field
 import logging
 
 from ...core.database import get_db
 from ...core.models import DataSourceORM, DataSource, SourceType
 from ...config.default_sources import get_source_categories as get_default_source_categories
+from ..caching import (
+    STATIC_CACHE_CONTROL, conditional_json_response, dashboard_cache, make_etag
+)
+from ..responses import DefaultJSONResponse
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
 
+_SOURCE_TYPE_DESCRIPTIONS = {
+    "news": "News websites and publications",
+    "blog": "Security blogs and expert commentary",
+    "social_media": "Social media platforms (Twitter, Reddit, etc.)",
+    "government": "Government security advisories and alerts",
+    "forum": "Security forums and discussion boards"
+}
+
+# Source types never change at runtime, so the dropdown payload is built once
+_SOURCE_TYPES_PAYLOAD = {
+    "types": [
+        {
+            "value": st.value,
+            "label": st.value.replace('_', ' ').title(),
+            "description": _SOURCE_TYPE_DESCRIPTIONS.get(st.value, "Custom source type")
+        }
+        for st in SourceType
+    ]
+}
+_VALID_SOURCE_TYPES = frozenset(st.value for st in SourceType)
+_VALID_SOURCE_TYPES_TEXT = ", ".join(st.value for st in SourceType)
+
+_SOURCE_TYPES_ETAG = make_etag(_SOURCE_TYPES_PAYLOAD)
+_SOURCE_CATEGORIES_ETAG = make_etag(get_default_source_categories())
+
+# Columns of the DataSource response model, in field order
+_SOURCE_COLUMNS = (
+    DataSourceORM.id,
+    DataSourceORM.name,
+    DataSourceORM.source_type,
+    DataSourceORM.url_pattern,
+    DataSourceORM.keywords,
+    DataSourceORM.scraping_config,
+    DataSourceORM.rate_limit,
+    DataSourceORM.enabled,
+    DataSourceORM.last_scraped,
+    DataSourceORM.created_at
+)
+
+def _source_row_to_dict(row) -> Dict[str, Any]:
+    """Convert a row of _SOURCE_COLUMNS to the JSON form of a DataSource."""
+    return {
+        "id": row.id,
+        "name": row.name,
+        "source_type": row.source_type,
+        "url_pattern": row.url_pattern,
+        "keywords": row.keywords or [],
+        "scraping_config": row.scraping_config or {},
+        "rate_limit": row.rate_limit,
+        "enabled": row.enabled,
+        "last_scraped": row.last_scraped.isoformat() if row.last_scraped else None,
+        "created_at": row.created_at.isoformat() if row.created_at else None
+    }
+
 class CreateSourceRequest(BaseModel):
     """Request model for creating a new source."""
     name: str = Field(..., min_length=1, max_length=100, description="Source name")
@@ -26,76 +86,68 @@ class CreateSourceRequest(BaseModel):
     enabled: Optional[bool] = Field(default=True, description="Whether source is enabled")
 
 @router.get("/", response_model=List[DataSource])
-async def get_sources(
+def get_sources(
     enabled_only: bool = Query(False, description="Return only enabled sources"),
     source_type: Optional[str] = Query(None, description="Filter by source type"),
     db: Session = Depends(get_db)
 ):
     """Get all configured sources."""
     try:
-        query = db.query(DataSourceORM)
+        query = select(*_SOURCE_COLUMNS)
         
         if enabled_only:
-            query = query.filter(DataSourceORM.enabled == True)
+            query = query.where(DataSourceORM.enabled == True)
         
         if source_type:
-            query = query.filter(DataSourceORM.source_type == source_type)
+            query = query.where(DataSourceORM.source_type == source_type)
         
-        sources = query.all()
+        # Rows are serialized directly; the values were validated on the way in
+        rows = db.execute(query).all()
         
-        return [DataSource.from_orm(source) for source in sources]
+        return DefaultJSONResponse(content=[_source_row_to_dict(row) for row in rows])
         
     except Exception as e:
-        logger.error(f"Error fetching sources: {e}")
+        logger.error("Error fetching sources: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.get("/categories")
-async def get_source_categories():
+async def get_source_categories(request: Request):
     """Get source categories for UI organization."""
     try:
-        return get_default_source_categories()
+        return conditional_json_response(
+            request, get_default_source_categories(), _SOURCE_CATEGORIES_ETAG,
+            STATIC_CACHE_CONTROL
+        )
     except Exception as e:
-        logger.error(f"Error fetching source categories: {e}")
+        logger.error("Error fetching source categories: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.get("/types")
-async def get_source_types():
+async def get_source_types(request: Request):
     """Get available source types for UI dropdown."""
-    try:
-        return {
-            "types": [
-                {
-                    "value": st.value,
-                    "label": st.value.replace('_', ' ').title(),
-                    "description": {
-                        "news": "News websites and publications",
-                        "blog": "Security blogs and expert commentary",
-                        "social_media": "Social media platforms (Twitter, Reddit, etc.)",
-                        "government": "Government security advisories and alerts",
-                        "forum": "Security forums and discussion boards"
-                    }.get(st.value, "Custom source type")
-                }
-                for st in SourceType
-            ]
-        }
-    except Exception as e:
-        logger.error(f"Error fetching source types: {e}")
-        raise HTTPException(status_code=500, detail=str(e))
+    return conditional_json_response(
+        request, _SOURCE_TYPES_PAYLOAD, _SOURCE_TYPES_ETAG, STATIC_CACHE_CONTROL
+    )
 
 @router.get("/stats/summary")
-async def get_source_stats(db: Session = Depends(get_db)):
+def get_source_stats(db: Session = Depends(get_db)):
     """Get source statistics summary."""
     try:
-        total_sources = db.query(DataSourceORM).count()
-        enabled_sources = db.query(DataSourceORM).filter(DataSourceORM.enabled == True).count()
+        # Total, enabled and per-type counts in one grouped query
+        rows = db.query(
+            DataSourceORM.source_type,
+            func.count(DataSourceORM.id).label("total"),
+            func.count().filter(DataSourceORM.enabled == True).label("enabled")
+        ).group_by(DataSourceORM.source_type).all()
+        
+        total_sources = sum(row.total for row in rows)
+        enabled_sources = sum(row.enabled for row in rows)
         
         # Count by source type
-        type_counts = {}
-        for source_type in SourceType:
-            count = db.query(DataSourceORM).filter(
-                DataSourceORM.source_type == source_type.value
-            ).count()
-            type_counts[source_type.value] = count
+        type_counts = {source_type.value: 0 for source_type in SourceType}
+        for row in rows:
+            if row.source_type in type_counts:
+                type_counts[row.source_type] = row.total
         
         return {
             "total_sources": total_sources,
@@ -106,14 +158,14 @@ async def get_source_stats(db: Session = Depends(get_db)):
         }
         
     except Exception as e:
-        logger.error(f"Error fetching source stats: {e}")
+        logger.error("Error fetching source stats: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.get("/{source_id}", response_model=DataSource)
-async def get_source(source_id: int, db: Session = Depends(get_db)):
+def get_source(source_id: int, db: Session = Depends(get_db)):
     """Get a specific source by ID."""
     try:
-        source = db.query(DataSourceORM).filter(DataSourceORM.id == source_id).first()
+        source = db.get(DataSourceORM, source_id)
         
         if not source:
             raise HTTPException(status_code=404, detail="Source not found")
@@ -123,22 +175,23 @@ async def get_source(source_id: int, db: Session = Depends(get_db)):
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Error fetching source {source_id}: {e}")
+        logger.error("Error fetching source %s: %s", source_id, e)
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.put("/{source_id}/toggle")
-async def toggle_source(source_id: int, db: Session = Depends(get_db)):
+def toggle_source(source_id: int, db: Session = Depends(get_db)):
     """Toggle source enabled/disabled status."""
     try:
-        source = db.query(DataSourceORM).filter(DataSourceORM.id == source_id).first()
+        source = db.get(DataSourceORM, source_id)
         
         if not source:
             raise HTTPException(status_code=404, detail="Source not found")
         
         source.enabled = not source.enabled
         db.commit()
+        dashboard_cache.invalidate()
         
-        logger.info(f"Source '{source.name}' {'enabled' if source.enabled else 'disabled'}")
+        logger.info("Source '%s' %s", source.name, 'enabled' if source.enabled else 'disabled')
         
         return {
             "id": source.id,
@@ -150,19 +203,19 @@ async def toggle_source(source_id: int, db: Session = Depends(get_db)):
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Error toggling source {source_id}: {e}")
+        logger.error("Error toggling source %s: %s", source_id, e)
         db.rollback()
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.put("/{source_id}")
-async def update_source(
+def update_source(
     source_id: int, 
     source_update: dict,
     db: Session = Depends(get_db)
 ):
     """Update source configuration."""
     try:
-        source = db.query(DataSourceORM).filter(DataSourceORM.id == source_id).first()
+        source = db.get(DataSourceORM, source_id)
         
         if not source:
             raise HTTPException(status_code=404, detail="Source not found")
@@ -174,41 +227,51 @@ async def update_source(
             if field in allowed_fields and hasattr(source, field):
                 setattr(source, field, value)
         
-        db.commit()
+        try:
+            db.commit()
+        except IntegrityError:
+            db.rollback()
+            raise HTTPException(
+                status_code=400, 
+                detail=f"Source with name '{source_update.get('name')}' already exists"
+            )
+        dashboard_cache.invalidate()
         
-        logger.info(f"Source '{source.name}' updated successfully")
+        logger.info("Source '%s' updated successfully", source.name)
         
         return DataSource.from_orm(source)
         
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Error updating source {source_id}: {e}")
+        logger.error("Error updating source %s: %s", source_id, e)
         db.rollback()
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.post("/bulk-toggle")
-async def bulk_toggle_sources(
+def bulk_toggle_sources(
     source_ids: List[int],
     enabled: bool,
     db: Session = Depends(get_db)
 ):
     """Bulk enable/disable multiple sources."""
     try:
-        sources = db.query(DataSourceORM).filter(DataSourceORM.id.in_(source_ids)).all()
+        result = db.execute(
+            update(DataSourceORM)
+            .where(DataSourceORM.id.in_(source_ids))
+            .values(enabled=enabled)
+        )
+        updated_count = result.rowcount
         
-        if not sources:
+        if not updated_count:
+            db.rollback()
             raise HTTPException(status_code=404, detail="No sources found")
         
-        updated_count = 0
-        for source in sources:
-            source.enabled = enabled
-            updated_count += 1
-        
         db.commit()
+        dashboard_cache.invalidate()
         
         action = "enabled" if enabled else "disabled"
-        logger.info(f"Bulk {action} {updated_count} sources")
+        logger.info("Bulk %s %s sources", action, updated_count)
         
         return {
             "updated_count": updated_count,
@@ -219,37 +282,25 @@ async def bulk_toggle_sources(
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Error bulk toggling sources: {e}")
+        logger.error("Error bulk toggling sources: %s", e)
         db.rollback()
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.post("/", response_model=DataSource)
-async def create_source(
+def create_source(
     source_data: CreateSourceRequest,
     db: Session = Depends(get_db)
 ):
     """Create a new source."""
     try:
         # Validate source type
-        valid_types = [st.value for st in SourceType]
-        if source_data.source_type not in valid_types:
+        if source_data.source_type not in _VALID_SOURCE_TYPES:
             raise HTTPException(
                 status_code=400, 
-                detail=f"Invalid source type. Must be one of: {', '.join(valid_types)}"
+                detail=f"Invalid source type. Must be one of: {_VALID_SOURCE_TYPES_TEXT}"
             )
         
-        # Check if source name already exists
-        existing_source = db.query(DataSourceORM).filter(
-            DataSourceORM.name == source_data.name
-        ).first()
-        
-        if existing_source:
-            raise HTTPException(
-                status_code=400, 
-                detail=f"Source with name '{source_data.name}' already exists"
-            )
-        
-        # Create new source
+        # Create new source; the unique index on name rejects duplicates
         new_source = DataSourceORM(
             name=source_data.name,
             source_type=source_data.source_type,
@@ -260,16 +311,24 @@ async def create_source(
         )
         
         db.add(new_source)
-        db.commit()
+        try:
+            db.commit()
+        except IntegrityError:
+            db.rollback()
+            raise HTTPException(
+                status_code=400, 
+                detail=f"Source with name '{source_data.name}' already exists"
+            )
+        dashboard_cache.invalidate()
         db.refresh(new_source)
         
-        logger.info(f"Created new source: {new_source.name} ({new_source.source_type})")
+        logger.info("Created new source: %s (%s)", new_source.name, new_source.source_type)
         
         return DataSource.from_orm(new_source)
         
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Error creating source: {e}")
+        logger.error("Error creating source: %s", e)
         db.rollback()
         raise HTTPException(status_code=500, detail=str(e))
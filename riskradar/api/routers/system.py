@@ -2,32 +2,165 @@
 API endpoints for system monitoring, health checks, and integration.
 """
 
-from fastapi import APIRouter, HTTPException, Depends, BackgroundTasks
+from fastapi import APIRouter, HTTPException, Depends, BackgroundTasks, Request
 from sqlalchemy.orm import Session
-from typing import Dict, Any, List
+from sqlalchemy import func
+from typing import Dict, Any, List, NamedTuple, Optional
 from datetime import datetime, timedelta
+import asyncio
 import logging
 import psutil
 import platform
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from functools import lru_cache
 
-from ...core.database import get_db, check_database_health
-from ...core.models import DataSourceORM, IncidentORM
-from ...scrapers.manager import ScrapingManager
-from ...analysis.sentiment import SentimentAnalyzer
-from ...analysis.risk_assessor import RiskAssessor
+from ...core.database import SessionLocal, get_db, check_database_health
+from ...core.models import DataSourceORM, IncidentORM, Incident, IncidentStatus, SeverityLevel
+from ...analysis.sentiment import get_sentiment_analyzer
+from ...analysis.risk_assessor import get_risk_assessor
+from ..caching import cached_json_response, dashboard_cache
+from .scraping import cached_scraping_status
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/api/system", tags=["system"])
 
+class ResourceSample(NamedTuple):
+    """CPU, memory and disk usage taken at one point in time."""
+    cpu_percent: float
+    memory: Any
+    disk: Any
+    taken_at: float
+
+class ResourceSampler:
+    """
+    Samples host resource usage in the background so requests never wait on psutil.
+    
+    CPU usage is measured with non-blocking psutil calls, as the change since
+    the previous sample, instead of blocking each request for a one-second
+    measurement window.
+    """
+    
+    def __init__(self, interval: float = 5.0, disk_interval: float = 30.0):
+        """
+        Initialize the sampler.
+        
+        Args:
+            interval: Seconds between CPU and memory samples
+            disk_interval: Seconds between disk usage samples
+        """
+        self.interval = interval
+        self.disk_interval = disk_interval
+        self._lock = threading.Lock()
+        self._disk = None
+        self._disk_taken_at = 0.0
+        
+        # The first non-blocking CPU reading only starts the measurement
+        psutil.cpu_percent(interval=None)
+        self._sample = self._take_sample()
+    
+    def _take_sample(self) -> ResourceSample:
+        now = time.monotonic()
+        if self._disk is None or now - self._disk_taken_at >= self.disk_interval:
+            self._disk = psutil.disk_usage('/')
+            self._disk_taken_at = now
+        
+        return ResourceSample(
+            cpu_percent=psutil.cpu_percent(interval=None),
+            memory=psutil.virtual_memory(),
+            disk=self._disk,
+            taken_at=now
+        )
+    
+    def refresh(self):
+        """Take a new sample now."""
+        with self._lock:
+            self._sample = self._take_sample()
+    
+    def sample(self) -> ResourceSample:
+        """Get the latest sample, refreshing it first if the background task is not keeping up."""
+        if time.monotonic() - self._sample.taken_at >= self.interval:
+            self.refresh()
+        return self._sample
+    
+    async def run(self):
+        """Refresh the sample every interval until cancelled; started with the app."""
+        while True:
+            self.refresh()
+            await asyncio.sleep(self.interval)
+
+resource_sampler = ResourceSampler()
+
 @router.get("/health")
-async def comprehensive_health_check(db: Session = Depends(get_db)):
+def comprehensive_health_check(request: Request):
     """
     Comprehensive system health check including all components.
     
     Returns:
         dict: Detailed health status of all system components
     """
+    return cached_json_response(
+        request, dashboard_cache, "system_health", _build_health_check, ttl_seconds=5
+    )
+
+def _probe_database() -> Dict[str, Any]:
+    """Check that the database answers a query."""
+    db_healthy = check_database_health()
+    return {
+        "status": "healthy" if db_healthy else "unhealthy",
+        "connection": "active" if db_healthy else "failed"
+    }
+
+def _probe_scraping_engine() -> Dict[str, Any]:
+    """Report the scraping engine's state."""
+    scraping_status = cached_scraping_status()
+    return {
+        "status": "healthy",
+        "is_running": scraping_status["is_running"],
+        "total_scraped": scraping_status["stats"].get("total_scraped", 0)
+    }
+
+def _probe_sentiment_analysis() -> Dict[str, Any]:
+    """Check that the sentiment analyzer can be loaded."""
+    get_sentiment_analyzer()
+    return {"status": "healthy", "module": "loaded"}
+
+def _probe_risk_assessment() -> Dict[str, Any]:
+    """Check that the risk assessor can be loaded."""
+    get_risk_assessor()
+    return {"status": "healthy", "module": "loaded"}
+
+def _probe_system_resources() -> Dict[str, Any]:
+    """Report the latest sampled host resource usage."""
+    resources = resource_sampler.sample()
+    return {
+        "status": "healthy",
+        "cpu_percent": resources.cpu_percent,
+        "memory_percent": resources.memory.percent,
+        "disk_percent": resources.disk.percent
+    }
+
+# Component name -> probe; a probe that raises reports its component unhealthy
+_HEALTH_PROBES = {
+    "database": _probe_database,
+    "scraping_engine": _probe_scraping_engine,
+    "sentiment_analysis": _probe_sentiment_analysis,
+    "risk_assessment": _probe_risk_assessment,
+    "system_resources": _probe_system_resources,
+}
+
+# Seconds a health check waits for its probes; slower ones are reported as timed out
+HEALTH_PROBE_TIMEOUT = 2.0
+
+# Probes run side by side, so a check takes as long as the slowest probe
+health_executor = ThreadPoolExecutor(
+    max_workers=len(_HEALTH_PROBES), thread_name_prefix="health"
+)
+
+def _build_health_check() -> Dict[str, Any]:
+    """Check every system component; failures are reported, not raised."""
     try:
         health_status = {
             "status": "healthy",
@@ -35,54 +168,28 @@ async def comprehensive_health_check(db: Session = Depends(get_db)):
             "components": {}
         }
         
-        # Database health
-        db_healthy = check_database_health()
-        health_status["components"]["database"] = {
-            "status": "healthy" if db_healthy else "unhealthy",
-            "connection": "active" if db_healthy else "failed"
+        futures = {
+            component: health_executor.submit(probe)
+            for component, probe in _HEALTH_PROBES.items()
         }
+        deadline = time.monotonic() + HEALTH_PROBE_TIMEOUT
         
-        # Scraping engine health
-        scraping_manager = ScrapingManager()
-        scraping_status = scraping_manager.get_scraping_status()
-        health_status["components"]["scraping_engine"] = {
-            "status": "healthy",
-            "is_running": scraping_status["is_running"],
-            "total_scraped": scraping_status["stats"].get("total_scraped", 0)
-        }
-        
-        # Analysis modules health
-        try:
-            sentiment_analyzer = SentimentAnalyzer()
-            health_status["components"]["sentiment_analysis"] = {
-                "status": "healthy",
-                "module": "loaded"
-            }
-        except Exception as e:
-            health_status["components"]["sentiment_analysis"] = {
-                "status": "unhealthy",
-                "error": str(e)
-            }
-        
-        try:
-            risk_assessor = RiskAssessor()
-            health_status["components"]["risk_assessment"] = {
-                "status": "healthy",
-                "module": "loaded"
-            }
-        except Exception as e:
-            health_status["components"]["risk_assessment"] = {
-                "status": "unhealthy",
-                "error": str(e)
-            }
-        
-        # System resources
-        health_status["components"]["system_resources"] = {
-            "status": "healthy",
-            "cpu_percent": psutil.cpu_percent(interval=1),
-            "memory_percent": psutil.virtual_memory().percent,
-            "disk_percent": psutil.disk_usage('/').percent
-        }
+        for component, future in futures.items():
+            try:
+                health_status["components"][component] = future.result(
+                    timeout=max(0.0, deadline - time.monotonic())
+                )
+            except FutureTimeoutError:
+                logger.warning("Health probe for %s timed out", component)
+                health_status["components"][component] = {
+                    "status": "unhealthy",
+                    "error": f"timed out after {HEALTH_PROBE_TIMEOUT}s"
+                }
+            except Exception as e:
+                health_status["components"][component] = {
+                    "status": "unhealthy",
+                    "error": str(e)
+                }
         
         # Overall status
         unhealthy_components = [
@@ -97,7 +204,7 @@ async def comprehensive_health_check(db: Session = Depends(get_db)):
         return health_status
         
     except Exception as e:
-        logger.error(f"Health check failed: {e}")
+        logger.error("Health check failed: %s", e)
         return {
             "status": "unhealthy",
             "error": str(e),
@@ -105,7 +212,7 @@ async def comprehensive_health_check(db: Session = Depends(get_db)):
         }
 
 @router.get("/metrics")
-async def get_system_metrics(db: Session = Depends(get_db)):
+async def get_system_metrics(request: Request, db: Session = Depends(get_db)):
     """
     Get comprehensive system metrics and statistics.
     
@@ -113,77 +220,85 @@ async def get_system_metrics(db: Session = Depends(get_db)):
         dict: System performance and usage metrics
     """
     try:
-        # Database metrics
-        total_sources = db.query(DataSourceORM).count()
-        enabled_sources = db.query(DataSourceORM).filter(DataSourceORM.enabled == True).count()
-        total_incidents = db.query(IncidentORM).count()
-        
-        # Recent activity (last 24 hours)
-        yesterday = datetime.utcnow() - timedelta(days=1)
-        recent_incidents = db.query(IncidentORM).filter(
-            IncidentORM.created_at >= yesterday
-        ).count()
-        
-        # Threat status distribution
-        confirmed_threats = db.query(IncidentORM).filter(
-            IncidentORM.status == "confirmed"
-        ).count()
-        pending_threats = db.query(IncidentORM).filter(
-            IncidentORM.status == "pending"
-        ).count()
-        dismissed_threats = db.query(IncidentORM).filter(
-            IncidentORM.status == "dismissed"
-        ).count()
-        
-        # Scraping metrics
-        scraping_manager = ScrapingManager()
-        scraping_stats = scraping_manager.get_scraping_status()["stats"]
-        
-        # System resource metrics
-        cpu_percent = psutil.cpu_percent(interval=1)
-        memory = psutil.virtual_memory()
-        disk = psutil.disk_usage('/')
-        
-        return {
-            "timestamp": datetime.utcnow().isoformat(),
-            "data_sources": {
-                "total": total_sources,
-                "enabled": enabled_sources,
-                "disabled": total_sources - enabled_sources
-            },
-            "incidents": {
-                "total": total_incidents,
-                "recent_24h": recent_incidents,
-                "confirmed": confirmed_threats,
-                "pending": pending_threats,
-                "dismissed": dismissed_threats
+        return cached_json_response(
+            request, dashboard_cache, "system_metrics",
+            lambda: _build_system_metrics(db)
+        )
+    
+    except Exception as e:
+        logger.error("Failed to get system metrics: %s", e)
+        raise HTTPException(status_code=500, detail=str(e))
+
+def _build_system_metrics(db: Session) -> Dict[str, Any]:
+    """Collect database, scraping and resource metrics."""
+    # Database metrics
+    sources = db.query(
+        func.count(DataSourceORM.id).label("total"),
+        func.count(DataSourceORM.id).filter(DataSourceORM.enabled == True).label("enabled")
+    ).one()
+    total_sources = sources.total
+    enabled_sources = sources.enabled
+    
+    # Totals, recent activity (last 24 hours) and threat status distribution
+    yesterday = datetime.utcnow() - timedelta(days=1)
+    incidents = db.query(
+        func.count(IncidentORM.id).label("total"),
+        func.count(IncidentORM.id).filter(IncidentORM.created_at >= yesterday).label("recent"),
+        func.count(IncidentORM.id).filter(IncidentORM.status == "confirmed").label("confirmed"),
+        func.count(IncidentORM.id).filter(IncidentORM.status == "pending").label("pending"),
+        func.count(IncidentORM.id).filter(IncidentORM.status == "dismissed").label("dismissed")
+    ).one()
+    total_incidents = incidents.total
+    recent_incidents = incidents.recent
+    confirmed_threats = incidents.confirmed
+    pending_threats = incidents.pending
+    dismissed_threats = incidents.dismissed
+    
+    # Scraping metrics
+    scraping_stats = cached_scraping_status()["stats"]
+    
+    # System resource metrics
+    resources = resource_sampler.sample()
+    cpu_percent = resources.cpu_percent
+    memory = resources.memory
+    disk = resources.disk
+    
+    return {
+        "timestamp": datetime.utcnow().isoformat(),
+        "data_sources": {
+            "total": total_sources,
+            "enabled": enabled_sources,
+            "disabled": total_sources - enabled_sources
+        },
+        "incidents": {
+            "total": total_incidents,
+            "recent_24h": recent_incidents,
+            "confirmed": confirmed_threats,
+            "pending": pending_threats,
+            "dismissed": dismissed_threats
+        },
+        "scraping": {
+            "total_scraped": scraping_stats.get("total_scraped", 0),
+            "successful_scrapes": scraping_stats.get("successful_scrapes", 0),
+            "failed_scrapes": scraping_stats.get("failed_scrapes", 0),
+            "total_items": scraping_stats.get("total_items_scraped", 0)
+        },
+        "system": {
+            "cpu_percent": cpu_percent,
+            "memory": {
+                "total_gb": round(memory.total / (1024**3), 2),
+                "used_gb": round(memory.used / (1024**3), 2),
+                "percent": memory.percent
             },
-            "scraping": {
-                "total_scraped": scraping_stats.get("total_scraped", 0),
-                "successful_scrapes": scraping_stats.get("successful_scrapes", 0),
-                "failed_scrapes": scraping_stats.get("failed_scrapes", 0),
-                "total_items": scraping_stats.get("total_items_scraped", 0)
+            "disk": {
+                "total_gb": round(disk.total / (1024**3), 2),
+                "used_gb": round(disk.used / (1024**3), 2),
+                "percent": round((disk.used / disk.total) * 100, 2)
             },
-            "system": {
-                "cpu_percent": cpu_percent,
-                "memory": {
-                    "total_gb": round(memory.total / (1024**3), 2),
-                    "used_gb": round(memory.used / (1024**3), 2),
-                    "percent": memory.percent
-                },
-                "disk": {
-                    "total_gb": round(disk.total / (1024**3), 2),
-                    "used_gb": round(disk.used / (1024**3), 2),
-                    "percent": round((disk.used / disk.total) * 100, 2)
-                },
-                "platform": platform.system(),
-                "python_version": platform.python_version()
-            }
+            "platform": platform.system(),
+            "python_version": platform.python_version()
         }
-        
-    except Exception as e:
-        logger.error(f"Failed to get system metrics: {e}")
-        raise HTTPException(status_code=500, detail=str(e))
+    }
 
 @router.get("/info")
 async def get_system_info():
@@ -194,112 +309,179 @@ async def get_system_info():
         dict: System information and version details
     """
     try:
-        return {
-            "application": {
-                "name": "RiskRadar",
-                "version": "1.0.0",
-                "description": "Early warning system for emerging threats",
-                "build_date": "2025-01-27"
-            },
-            "system": {
-                "platform": platform.system(),
-                "platform_release": platform.release(),
-                "platform_version": platform.version(),
-                "architecture": platform.machine(),
-                "processor": platform.processor(),
-                "python_version": platform.python_version(),
-                "hostname": platform.node()
-            },
-            "features": {
-                "web_scraping": True,
-                "sentiment_analysis": True,
-                "risk_assessment": True,
-                "threat_triaging": True,
-                "real_time_monitoring": True,
-                "api_endpoints": True,
-                "web_interface": True
-            },
-            "endpoints": {
-                "api_docs": "/api/docs",
-                "health_check": "/api/system/health",
-                "metrics": "/api/system/metrics",
-                "scraping": "/api/scraping/*",
-                "threats": "/api/threats/*",
-                "sources": "/api/sources/*"
-            }
+        return _system_info()
+    
+    except Exception as e:
+        logger.error("Failed to get system info: %s", e)
+        raise HTTPException(status_code=500, detail=str(e))
+
+@lru_cache(maxsize=None)
+def _system_info() -> Dict[str, Any]:
+    """Describe the application and host; fixed for the life of the process."""
+    return {
+        "application": {
+            "name": "RiskRadar",
+            "version": "1.0.0",
+            "description": "Early warning system for emerging threats",
+            "build_date": "2025-01-27"
+        },
+        "system": {
+            "platform": platform.system(),
+            "platform_release": platform.release(),
+            "platform_version": platform.version(),
+            "architecture": platform.machine(),
+            "processor": platform.processor(),
+            "python_version": platform.python_version(),
+            "hostname": platform.node()
+        },
+        "features": {
+            "web_scraping": True,
+            "sentiment_analysis": True,
+            "risk_assessment": True,
+            "threat_triaging": True,
+            "real_time_monitoring": True,
+            "api_endpoints": True,
+            "web_interface": True
+        },
+        "endpoints": {
+            "api_docs": "/api/docs",
+            "health_check": "/api/system/health",
+            "metrics": "/api/system/metrics",
+            "scraping": "/api/scraping/*",
+            "threats": "/api/threats/*",
+            "sources": "/api/sources/*"
+        }
+    }
+
+def _analyze_content(content: Dict[str, Any]) -> Optional[IncidentORM]:
+    """
+    Run sentiment analysis and risk assessment on one piece of content.
+    
+    Args:
+        content: Content to analyze (title, description, url, etc.)
+    
+    Returns:
+        IncidentORM: Unsaved incident if the content is a threat, otherwise None
+    """
+    title = content["title"]
+    description = content["description"]
+    url = content.get("url")
+    
+    # Sentiment analysis
+    sentiment_analyzer = get_sentiment_analyzer()
+    sentiment_score = sentiment_analyzer.analyze_sentiment(f"{title} {description}")
+    
+    incident = Incident(
+        title=title,
+        description=description,
+        keywords=content.get("keywords", []),
+        severity=content.get("severity", SeverityLevel.MEDIUM),
+        confidence_score=content.get("confidence_score", 0.5),
+        risk_score=0.0,
+        sentiment_score=sentiment_score,
+        source_urls=[url] if url else [],
+        incident_metadata={
+            "source_type": content.get("source_type", "unknown"),
+            "source_name": content.get("source_name", "manual")
         }
+    )
+    
+    # Risk assessment
+    risk_assessor = get_risk_assessor()
+    risk = risk_assessor.assess_risk(incident)
+    risk_category = risk_assessor.categorize_risk(risk)
+    
+    # Only threats (medium risk or above) are stored
+    if risk_category in ("minimal", "low"):
+        return None
+    
+    return IncidentORM(
+        id=incident.id,
+        title=incident.title,
+        description=incident.description,
+        keywords=incident.keywords,
+        severity=incident.severity.value,
+        status=IncidentStatus.DETECTED.value,
+        confidence_score=incident.confidence_score,
+        # Stored incidents use a 0-10 risk scale
+        risk_score=risk * 10.0,
+        sentiment_score=incident.sentiment_score,
+        source_urls=incident.source_urls,
+        incident_metadata={
+            **incident.incident_metadata,
+            "sentiment": sentiment_analyzer.get_sentiment_summary(sentiment_score),
+            "risk_assessment": {"score": risk, "category": risk_category},
+            "processed_at": datetime.utcnow().isoformat()
+        }
+    )
+
+def _process_contents(contents: List[Dict[str, Any]]):
+    """
+    Background task that analyzes contents and stores the threats found.
+    
+    Runs after the response is sent, so it uses its own session rather than
+    the request's, and stores all incidents in one transaction.
+    """
+    incidents = []
+    for content in contents:
+        try:
+            incident = _analyze_content(content)
+        except Exception as e:
+            logger.error("Failed to process threat: %s", e)
+            continue
         
+        if incident is not None:
+            incidents.append(incident)
+    
+    if not incidents:
+        return
+    
+    # Committing expires the instances, so read titles while they are loaded
+    titles = [incident.title for incident in incidents]
+    try:
+        with SessionLocal() as db:
+            db.add_all(incidents)
+            db.commit()
     except Exception as e:
-        logger.error(f"Failed to get system info: {e}")
-        raise HTTPException(status_code=500, detail=str(e))
+        logger.error("Failed to store %s processed threats: %s", len(incidents), e)
+        return
+    
+    dashboard_cache.invalidate()
+    for title in titles:
+        logger.info("Threat processed and stored: %s", title)
+
+def _validate_content(content: Dict[str, Any]):
+    """Reject content the pipeline cannot analyze."""
+    if not content.get("title") or not content.get("description"):
+        raise HTTPException(
+            status_code=400,
+            detail="Content must include title and description"
+        )
+    
+    severity = content.get("severity", SeverityLevel.MEDIUM.value)
+    if severity not in {level.value for level in SeverityLevel}:
+        raise HTTPException(status_code=400, detail=f"Invalid severity: {severity}")
 
 @router.post("/process-threat")
 async def process_threat_pipeline(
     background_tasks: BackgroundTasks,
-    content: Dict[str, Any],
-    db: Session = Depends(get_db)
+    content: Dict[str, Any]
 ):
     """
     Process a single piece of content through the complete threat analysis pipeline.
     
     Args:
         content: Content to analyze (title, description, url, etc.)
-        db: Database session
     
     Returns:
         dict: Analysis results and threat assessment
     """
     try:
         # Validate input
-        if not content.get("title") or not content.get("description"):
-            raise HTTPException(
-                status_code=400,
-                detail="Content must include title and description"
-            )
-        
-        def analyze_content():
-            """Background task to analyze content."""
-            try:
-                # Sentiment analysis
-                sentiment_analyzer = SentimentAnalyzer()
-                sentiment_result = sentiment_analyzer.analyze_text(
-                    content.get("description", "")
-                )
-                
-                # Risk assessment
-                risk_assessor = RiskAssessor()
-                risk_result = risk_assessor.assess_risk(content)
-                
-                # Store results if threat is confirmed
-                if risk_result.get("is_threat", False):
-                    # Create incident record
-                    incident = IncidentORM(
-                        title=content["title"],
-                        description=content["description"],
-                        url=content.get("url", ""),
-                        source_name=content.get("source_name", "manual"),
-                        risk_score=risk_result.get("risk_score", 0.5),
-                        severity=risk_result.get("severity", "medium"),
-                        status="pending",
-                        keywords=content.get("keywords", []),
-                        sentiment_score=sentiment_result.get("score", 0.0),
-                        incident_metadata={
-                            "sentiment": sentiment_result,
-                            "risk_assessment": risk_result,
-                            "processed_at": datetime.utcnow().isoformat()
-                        }
-                    )
-                    
-                    db.add(incident)
-                    db.commit()
-                    
-                    logger.info(f"Threat processed and stored: {content['title']}")
-                
-            except Exception as e:
-                logger.error(f"Failed to process threat: {e}")
+        _validate_content(content)
         
         # Start background processing
-        background_tasks.add_task(analyze_content)
+        background_tasks.add_task(_process_contents, [content])
         
         return {
             "status": "processing",
@@ -311,7 +493,47 @@ async def process_threat_pipeline(
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Failed to submit content for processing: {e}")
+        logger.error("Failed to submit content for processing: %s", e)
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.post("/process-threats")
+async def process_threats_pipeline(
+    background_tasks: BackgroundTasks,
+    contents: List[Dict[str, Any]]
+):
+    """
+    Process a batch of content through the threat analysis pipeline.
+    
+    Contents assessed as medium risk or above are stored as incidents,
+    together in a single transaction.
+    
+    Args:
+        contents: Contents to analyze (title, description, url, etc.)
+    
+    Returns:
+        dict: Submission summary
+    """
+    try:
+        # Validate input
+        if not contents:
+            raise HTTPException(status_code=400, detail="No content provided")
+        for content in contents:
+            _validate_content(content)
+        
+        # Start background processing
+        background_tasks.add_task(_process_contents, contents)
+        
+        return {
+            "status": "processing",
+            "message": f"{len(contents)} items submitted for threat analysis",
+            "content_ids": [content.get("id", "unknown") for content in contents],
+            "timestamp": datetime.utcnow().isoformat()
+        }
+    
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error("Failed to submit content batch for processing: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.get("/logs")
@@ -349,5 +571,5 @@ async def get_system_logs(
         }
         
     except Exception as e:
-        logger.error(f"Failed to get system logs: {e}")
+        logger.error("Failed to get system logs: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
@@ -2,20 +2,29 @@
 API router for threat management and exploration endpoints.
 """
 
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
 from sqlalchemy.orm import Session
-from sqlalchemy import desc, asc, and_, or_
-from typing import List, Optional
+from sqlalchemy import Text, cast, desc, asc, and_, or_, func, update
+from typing import Any, Dict, List, Optional
 from datetime import datetime, timedelta
+import json
 import logging
 
 from ...core.database import get_db
-from ...core.models import IncidentORM, Incident, SeverityLevel, IncidentStatus
+from ...core.models import IncidentORM, Incident, IncidentListItem, SeverityLevel, IncidentStatus
+from ..caching import cached_json_response, dashboard_cache
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
 
-@router.get("/", response_model=List[Incident])
+# Threat list sort fields; each is the leading column of an incidents index
+_SORTABLE_COLUMNS = {
+    "created_at": IncidentORM.created_at,
+    "risk_score": IncidentORM.risk_score,
+    "severity": IncidentORM.severity,
+}
+
+@router.get("/", response_model=List[IncidentListItem])
 async def get_threats(
     status: Optional[str] = Query(None, description="Filter by status (confirmed, pending, dismissed)"),
     severity: Optional[str] = Query(None, description="Filter by severity (low, medium, high, critical)"),
@@ -30,7 +39,24 @@ async def get_threats(
 ):
     """Get threats with filtering and pagination."""
     try:
-        query = db.query(IncidentORM)
+        sort_field = _SORTABLE_COLUMNS.get(sort_by)
+        if sort_field is None:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Invalid sort field. Must be one of: {list(_SORTABLE_COLUMNS)}"
+            )
+        
+        # Only the list fields; descriptions, entities and metadata stay in the database
+        query = db.query(
+            IncidentORM.id,
+            IncidentORM.title,
+            IncidentORM.keywords,
+            IncidentORM.severity,
+            IncidentORM.status,
+            IncidentORM.risk_score,
+            IncidentORM.source_type,
+            IncidentORM.created_at
+        )
         
         # Date filter
         cutoff_date = datetime.utcnow() - timedelta(days=days_back)
@@ -46,19 +72,20 @@ async def get_threats(
         
         # Source type filter
         if source_type:
-            query = query.filter(IncidentORM.incident_metadata.contains({"source_type": source_type}))
+            query = query.filter(IncidentORM.source_type == source_type)
         
-        # Keyword search
+        # Keyword search; on PostgreSQL the substring matches are served by
+        # the trigram indexes on title and description
         if keyword:
             keyword_filter = or_(
                 IncidentORM.title.ilike(f"%{keyword}%"),
                 IncidentORM.description.ilike(f"%{keyword}%"),
-                IncidentORM.keywords.contains([keyword])
+                # Exact keyword list entry; json has no LIKE operator in PostgreSQL
+                cast(IncidentORM.keywords, Text).contains(json.dumps(keyword))
             )
             query = query.filter(keyword_filter)
         
         # Sorting
-        sort_field = getattr(IncidentORM, sort_by, IncidentORM.created_at)
         if sort_order.lower() == "desc":
             query = query.order_by(desc(sort_field))
         else:
@@ -69,10 +96,12 @@ async def get_threats(
         
         incidents = query.all()
         
-        return [Incident.from_orm(incident) for incident in incidents]
+        return [IncidentListItem.from_orm(incident) for incident in incidents]
         
+    except HTTPException:
+        raise
     except Exception as e:
-        logger.error(f"Error fetching threats: {e}")
+        logger.error("Error fetching threats: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.get("/{threat_id}", response_model=Incident)
@@ -89,7 +118,7 @@ async def get_threat(threat_id: int, db: Session = Depends(get_db)):
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Error fetching threat {threat_id}: {e}")
+        logger.error("Error fetching threat %s: %s", threat_id, e)
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.put("/{threat_id}/status")
@@ -118,8 +147,9 @@ async def update_threat_status(
         incident.updated_at = datetime.utcnow()
         
         db.commit()
+        dashboard_cache.invalidate()
         
-        logger.info(f"Threat {threat_id} status changed from {old_status} to {new_status}")
+        logger.info("Threat %s status changed from %s to %s", threat_id, old_status, new_status)
         
         return {
             "id": threat_id,
@@ -131,158 +161,161 @@ async def update_threat_status(
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Error updating threat status {threat_id}: {e}")
+        logger.error("Error updating threat status %s: %s", threat_id, e)
         db.rollback()
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.get("/stats/summary")
 async def get_threat_stats(
+    request: Request,
     days_back: int = Query(30, description="Number of days for statistics"),
     db: Session = Depends(get_db)
 ):
     """Get threat statistics summary."""
     try:
-        cutoff_date = datetime.utcnow() - timedelta(days=days_back)
-        
-        # Total counts
-        total_threats = db.query(IncidentORM).filter(
-            IncidentORM.created_at >= cutoff_date
-        ).count()
-        
-        confirmed_threats = db.query(IncidentORM).filter(
-            and_(
-                IncidentORM.created_at >= cutoff_date,
-                IncidentORM.status == "confirmed"
-            )
-        ).count()
-        
-        pending_threats = db.query(IncidentORM).filter(
-            and_(
-                IncidentORM.created_at >= cutoff_date,
-                IncidentORM.status == "pending"
-            )
-        ).count()
-        
-        dismissed_threats = db.query(IncidentORM).filter(
-            and_(
-                IncidentORM.created_at >= cutoff_date,
-                IncidentORM.status == "dismissed"
-            )
-        ).count()
-        
-        # Severity breakdown
-        severity_counts = {}
-        for severity in SeverityLevel:
-            count = db.query(IncidentORM).filter(
-                and_(
-                    IncidentORM.created_at >= cutoff_date,
-                    IncidentORM.severity == severity.value
-                )
-            ).count()
-            severity_counts[severity.value] = count
-        
-        # Risk score statistics
-        risk_stats = db.query(IncidentORM).filter(
-            IncidentORM.created_at >= cutoff_date
-        ).all()
-        
-        if risk_stats:
-            risk_scores = [incident.risk_score for incident in risk_stats]
-            avg_risk_score = sum(risk_scores) / len(risk_scores)
-            max_risk_score = max(risk_scores)
-            min_risk_score = min(risk_scores)
-        else:
-            avg_risk_score = max_risk_score = min_risk_score = 0
-        
-        # Recent high-risk threats
-        high_risk_threats = db.query(IncidentORM).filter(
-            and_(
-                IncidentORM.created_at >= cutoff_date,
-                IncidentORM.risk_score >= 7.0
-            )
-        ).order_by(desc(IncidentORM.risk_score)).limit(5).all()
-        
-        return {
-            "period_days": days_back,
-            "total_threats": total_threats,
-            "confirmed_threats": confirmed_threats,
-            "pending_threats": pending_threats,
-            "dismissed_threats": dismissed_threats,
-            "confirmation_rate": round((confirmed_threats / max(1, total_threats)) * 100, 1),
-            "severity_breakdown": severity_counts,
-            "risk_score_stats": {
-                "average": round(avg_risk_score, 2),
-                "maximum": round(max_risk_score, 2),
-                "minimum": round(min_risk_score, 2)
-            },
-            "high_risk_count": len(high_risk_threats),
-            "recent_high_risk": [
-                {
-                    "id": threat.id,
-                    "title": threat.title[:100] + "..." if len(threat.title) > 100 else threat.title,
-                    "risk_score": threat.risk_score,
-                    "severity": threat.severity,
-                    "created_at": threat.created_at.isoformat()
-                }
-                for threat in high_risk_threats
-            ]
-        }
-        
+        return cached_json_response(
+            request, dashboard_cache, ("threat_stats", days_back),
+            lambda: _build_threat_stats(db, days_back)
+        )
+    
     except Exception as e:
-        logger.error(f"Error fetching threat stats: {e}")
+        logger.error("Error fetching threat stats: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
 
+def _build_threat_stats(db: Session, days_back: int) -> Dict[str, Any]:
+    """Compute threat statistics for the last days_back days."""
+    cutoff_date = datetime.utcnow() - timedelta(days=days_back)
+    
+    # Counts, severity breakdown and risk score statistics in one query
+    severity_columns = [
+        func.count().filter(IncidentORM.severity == severity.value).label(severity.value)
+        for severity in SeverityLevel
+    ]
+    stats = db.query(
+        func.count().label("total"),
+        func.count().filter(IncidentORM.status == "confirmed").label("confirmed"),
+        func.count().filter(IncidentORM.status == "pending").label("pending"),
+        func.count().filter(IncidentORM.status == "dismissed").label("dismissed"),
+        func.avg(IncidentORM.risk_score).label("avg_risk_score"),
+        func.max(IncidentORM.risk_score).label("max_risk_score"),
+        func.min(IncidentORM.risk_score).label("min_risk_score"),
+        *severity_columns
+    ).filter(
+        IncidentORM.created_at >= cutoff_date
+    ).one()
+    
+    total_threats = stats.total
+    confirmed_threats = stats.confirmed
+    pending_threats = stats.pending
+    dismissed_threats = stats.dismissed
+    
+    # Severity breakdown
+    severity_counts = {
+        severity.value: stats._mapping[severity.value] for severity in SeverityLevel
+    }
+    
+    # Risk score statistics
+    if total_threats:
+        avg_risk_score = stats.avg_risk_score
+        max_risk_score = stats.max_risk_score
+        min_risk_score = stats.min_risk_score
+    else:
+        avg_risk_score = max_risk_score = min_risk_score = 0
+    
+    # Recent high-risk threats; only the displayed columns are loaded, and
+    # titles are cut down by the database one character past the display
+    # limit so truncation can still be detected
+    high_risk_threats = db.query(
+        IncidentORM.id,
+        func.substr(IncidentORM.title, 1, 101).label("title"),
+        IncidentORM.risk_score,
+        IncidentORM.severity,
+        IncidentORM.created_at
+    ).filter(
+        and_(
+            IncidentORM.created_at >= cutoff_date,
+            IncidentORM.risk_score >= 7.0
+        )
+    ).order_by(desc(IncidentORM.risk_score)).limit(5).all()
+    
+    return {
+        "period_days": days_back,
+        "total_threats": total_threats,
+        "confirmed_threats": confirmed_threats,
+        "pending_threats": pending_threats,
+        "dismissed_threats": dismissed_threats,
+        "confirmation_rate": round((confirmed_threats / max(1, total_threats)) * 100, 1),
+        "severity_breakdown": severity_counts,
+        "risk_score_stats": {
+            "average": round(avg_risk_score, 2),
+            "maximum": round(max_risk_score, 2),
+            "minimum": round(min_risk_score, 2)
+        },
+        "high_risk_count": len(high_risk_threats),
+        "recent_high_risk": [
+            {
+                "id": threat.id,
+                "title": threat.title[:100] + "..." if len(threat.title) > 100 else threat.title,
+                "risk_score": threat.risk_score,
+                "severity": threat.severity,
+                "created_at": threat.created_at.isoformat()
+            }
+            for threat in high_risk_threats
+        ]
+    }
+
 @router.get("/stats/timeline")
 async def get_threat_timeline(
+    request: Request,
     days_back: int = Query(7, description="Number of days for timeline"),
     db: Session = Depends(get_db)
 ):
     """Get threat timeline data for charts."""
     try:
-        cutoff_date = datetime.utcnow() - timedelta(days=days_back)
-        
-        # Get incidents grouped by day
-        incidents = db.query(IncidentORM).filter(
-            IncidentORM.created_at >= cutoff_date
-        ).order_by(IncidentORM.created_at).all()
-        
-        # Group by date
-        timeline_data = {}
-        for incident in incidents:
-            date_key = incident.created_at.date().isoformat()
-            
-            if date_key not in timeline_data:
-                timeline_data[date_key] = {
-                    "date": date_key,
-                    "total": 0,
-                    "confirmed": 0,
-                    "pending": 0,
-                    "dismissed": 0,
-                    "avg_risk_score": 0,
-                    "risk_scores": []
-                }
-            
-            timeline_data[date_key]["total"] += 1
-            timeline_data[date_key][incident.status] += 1
-            timeline_data[date_key]["risk_scores"].append(incident.risk_score)
-        
-        # Calculate average risk scores
-        for date_data in timeline_data.values():
-            if date_data["risk_scores"]:
-                date_data["avg_risk_score"] = round(
-                    sum(date_data["risk_scores"]) / len(date_data["risk_scores"]), 2
-                )
-            del date_data["risk_scores"]  # Remove raw scores from response
-        
-        return {
-            "period_days": days_back,
-            "timeline": list(timeline_data.values())
-        }
+        return cached_json_response(
+            request, dashboard_cache, ("threat_timeline", days_back),
+            lambda: _build_threat_timeline(db, days_back)
+        )
         
     except Exception as e:
-        logger.error(f"Error fetching threat timeline: {e}")
+        logger.error("Error fetching threat timeline: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
 
+def _build_threat_timeline(db: Session, days_back: int) -> Dict[str, Any]:
+    """Compute per-day threat counts for the last days_back days."""
+    cutoff_date = datetime.utcnow() - timedelta(days=days_back)
+    
+    # Per-day counts and average risk score, aggregated by the database
+    day = func.date(IncidentORM.created_at)
+    daily_rows = db.query(
+        day.label("day"),
+        func.count().label("total"),
+        func.count().filter(IncidentORM.status == "confirmed").label("confirmed"),
+        func.count().filter(IncidentORM.status == "pending").label("pending"),
+        func.count().filter(IncidentORM.status == "dismissed").label("dismissed"),
+        func.avg(IncidentORM.risk_score).label("avg_risk_score")
+    ).filter(
+        IncidentORM.created_at >= cutoff_date
+    ).group_by(day).order_by(day).all()
+    
+    timeline = []
+    for row in daily_rows:
+        # SQLite returns the day as text, PostgreSQL as a date
+        date_key = row.day if isinstance(row.day, str) else row.day.isoformat()
+        timeline.append({
+            "date": date_key,
+            "total": row.total,
+            "confirmed": row.confirmed,
+            "pending": row.pending,
+            "dismissed": row.dismissed,
+            "avg_risk_score": round(row.avg_risk_score, 2) if row.avg_risk_score is not None else 0
+        })
+    
+    return {
+        "period_days": days_back,
+        "timeline": timeline
+    }
+
 @router.post("/bulk-update")
 async def bulk_update_threats(
     threat_ids: List[int],
@@ -292,13 +325,6 @@ async def bulk_update_threats(
 ):
     """Bulk update multiple threats."""
     try:
-        threats = db.query(IncidentORM).filter(IncidentORM.id.in_(threat_ids)).all()
-        
-        if not threats:
-            raise HTTPException(status_code=404, detail="No threats found")
-        
-        updated_count = 0
-        
         if action == "status" and value:
             valid_statuses = ["confirmed", "dismissed", "pending", "investigating"]
             if value not in valid_statuses:
@@ -307,17 +333,26 @@ async def bulk_update_threats(
                     detail=f"Invalid status. Must be one of: {valid_statuses}"
                 )
             
-            for threat in threats:
-                threat.status = value
-                threat.updated_at = datetime.utcnow()
-                updated_count += 1
+            # One UPDATE for every matching threat
+            result = db.execute(
+                update(IncidentORM)
+                .where(IncidentORM.id.in_(threat_ids))
+                .values(status=value, updated_at=datetime.utcnow())
+                .execution_options(synchronize_session=False)
+            )
+            updated_count = result.rowcount
         
         else:
             raise HTTPException(status_code=400, detail="Invalid bulk action")
         
+        if not updated_count:
+            db.rollback()
+            raise HTTPException(status_code=404, detail="No threats found")
+        
         db.commit()
+        dashboard_cache.invalidate()
         
-        logger.info(f"Bulk updated {updated_count} threats: {action}={value}")
+        logger.info("Bulk updated %s threats: %s=%s", updated_count, action, value)
         
         return {
             "updated_count": updated_count,
@@ -329,6 +364,6 @@ async def bulk_update_threats(
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Error bulk updating threats: {e}")
+        logger.error("Error bulk updating threats: %s", e)
         db.rollback()
         raise HTTPException(status_code=500, detail=str(e))
@@ -6,29 +6,24 @@ Allows users to specify topics for targeted threat scanning and analysis.
 from fastapi import APIRouter, HTTPException, BackgroundTasks, Depends
 from pydantic import BaseModel, Field
 from typing import List, Dict, Any, Optional
-import asyncio
+from collections import Counter
+from dataclasses import dataclass, field
 import logging
+import re
 from datetime import datetime, timedelta
 
-from riskradar.analysis.risk_assessor import RiskAssessor
-from riskradar.analysis.sentiment import analyze_sentiment
-from riskradar.core.database import SessionLocal
 from ...scrapers.manager import ScrapingManager
-from ...analysis.sentiment import SentimentAnalyzer
-from ...analysis.risk_assessor import RiskAssessor
-from ...core.database import get_db
-from ...core.models import DataSourceORM, IncidentORM, SourceType
+from ...config.default_sources import get_default_sources, get_sources_by_types
+from ...core.database import SessionLocal, get_db
+from ...core.models import IncidentORM, SourceType
+from ..caching import dashboard_cache
+from sqlalchemy import insert, or_
 from sqlalchemy.orm import Session
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/api/topic-analysis")
 
-# Global instances
-scraping_manager = ScrapingManager()
-sentiment_analyzer = SentimentAnalyzer()
-risk_assessor = RiskAssessor()
-
 class TopicAnalysisRequest(BaseModel):
     """Request model for topic-based threat analysis."""
     topic: str = Field(..., description="Topic to analyze for threats", min_length=2, max_length=200)
@@ -53,8 +48,7 @@ class TopicAnalysisResult(BaseModel):
 @router.post("/scan", response_model=Dict[str, Any])
 async def start_topic_analysis(
     request: TopicAnalysisRequest,
-    background_tasks: BackgroundTasks,
-    db: Session = Depends(get_db)
+    background_tasks: BackgroundTasks
 ):
     """
     Start a topic-based threat analysis scan.
@@ -90,11 +84,11 @@ async def start_topic_analysis(
         }
         
     except Exception as e:
-        logger.error(f"Error starting topic analysis: {e}")
+        logger.error("Error starting topic analysis: %s", e)
         raise HTTPException(status_code=500, detail=f"Failed to start analysis: {str(e)}")
 
 @router.get("/results/{topic}", response_model=TopicAnalysisResult)
-async def get_topic_analysis_results(
+def get_topic_analysis_results(
     topic: str,
     db: Session = Depends(get_db)
 ):
@@ -103,21 +97,14 @@ async def get_topic_analysis_results(
         # Query recent incidents related to the topic
         cutoff_time = datetime.utcnow() - timedelta(hours=24)
         
-        # Query all recent incidents and filter by metadata search_topic
-        all_incidents = db.query(IncidentORM).filter(
-            IncidentORM.created_at >= cutoff_time
-        ).order_by(IncidentORM.created_at.desc()).all()
-        
-        # Filter incidents that match the topic in metadata or title
-        incidents = []
-        for incident in all_incidents:
-            metadata = incident.incident_metadata or {}
-            if (metadata.get('search_topic') == topic or 
-                topic.lower() in incident.title.lower()):
-                incidents.append(incident)
-        
-        # Limit to 50 most recent matching incidents
-        incidents = incidents[:50]
+        # 50 most recent incidents that match the topic in metadata or title
+        incidents = db.query(IncidentORM).filter(
+            IncidentORM.created_at >= cutoff_time,
+            or_(
+                IncidentORM.incident_metadata["search_topic"].as_string() == topic,
+                IncidentORM.title.icontains(topic, autoescape=True)
+            )
+        ).order_by(IncidentORM.created_at.desc()).limit(50).all()
         
         if not incidents:
             return TopicAnalysisResult(
@@ -134,41 +121,44 @@ async def get_topic_analysis_results(
             )
         
         # Analyze the incidents
-        logger.info(f"Analyzing {len(incidents)} incidents for topic: {topic}")
+        logger.info("Analyzing %s incidents for topic: %s", len(incidents), topic)
+        
+        # One pass over the incidents feeds every summary below
+        agg = aggregate_incidents(incidents)
         
         try:
-            threat_summary = analyze_threat_patterns(incidents)
+            threat_summary = analyze_threat_patterns(agg)
             logger.info("Threat patterns analyzed successfully")
         except Exception as e:
-            logger.error(f"Error in analyze_threat_patterns: {e}")
+            logger.error("Error in analyze_threat_patterns: %s", e)
             raise
             
         try:
-            sentiment_summary = analyze_sentiment_patterns(incidents)
+            sentiment_summary = analyze_sentiment_patterns(agg)
             logger.info("Sentiment patterns analyzed successfully")
         except Exception as e:
-            logger.error(f"Error in analyze_sentiment_patterns: {e}")
+            logger.error("Error in analyze_sentiment_patterns: %s", e)
             raise
             
         try:
-            risk_level = determine_overall_risk(incidents)
+            risk_level = determine_overall_risk(agg)
             logger.info("Risk level determined successfully")
         except Exception as e:
-            logger.error(f"Error in determine_overall_risk: {e}")
+            logger.error("Error in determine_overall_risk: %s", e)
             raise
             
         try:
-            key_findings = extract_key_findings(incidents, topic)
+            key_findings = extract_key_findings(agg, topic)
             logger.info("Key findings extracted successfully")
         except Exception as e:
-            logger.error(f"Error in extract_key_findings: {e}")
+            logger.error("Error in extract_key_findings: %s", e)
             raise
             
         try:
             recommendations = generate_recommendations(risk_level, threat_summary)
             logger.info("Recommendations generated successfully")
         except Exception as e:
-            logger.error(f"Error in generate_recommendations: {e}")
+            logger.error("Error in generate_recommendations: %s", e)
             raise
         
         # Build detailed results with error handling
@@ -184,10 +174,10 @@ async def get_topic_analysis_results(
                     "url": incident.source_urls[0] if incident.source_urls else ''
                 }
                 detailed_results.append(result)
-                logger.debug(f"Successfully processed incident: {incident.title}")
+                logger.debug("Successfully processed incident: %s", incident.title)
             except Exception as e:
-                logger.error(f"Error processing incident {incident.id}: {e}")
-                logger.error(f"Incident attributes: {dir(incident)}")
+                logger.error("Error processing incident %s: %s", incident.id, e)
+                logger.error("Incident attributes: %s", dir(incident))
                 # Skip this incident and continue
                 continue
         
@@ -225,11 +215,11 @@ async def get_topic_analysis_results(
         )
         
     except Exception as e:
-        logger.error(f"Error getting topic analysis results: {e}")
+        logger.error("Error getting topic analysis results: %s", e)
         raise HTTPException(status_code=500, detail=f"Failed to get results: {str(e)}")
 
 @router.get("/trending-topics", response_model=Dict[str, Any])
-async def get_trending_topics(
+def get_trending_topics(
     db: Session = Depends(get_db),
     hours: int = 24
 ):
@@ -237,21 +227,23 @@ async def get_trending_topics(
     try:
         cutoff_time = datetime.utcnow() - timedelta(hours=hours)
         
-        incidents = db.query(IncidentORM).filter(
-            IncidentORM.created_at >= cutoff_time
-        ).all()
-        
-        # Extract common keywords and topics
-        topic_counts = {}
-        for incident in incidents:
-            # Simple keyword extraction from titles
-            words = incident.title.lower().split()
-            for word in words:
-                if len(word) > 4 and word.isalpha():  # Filter meaningful words
-                    topic_counts[word] = topic_counts.get(word, 0) + 1
+        # Only titles are needed for keyword extraction
+        titles = [
+            title for (title,) in db.query(IncidentORM.title).filter(
+                IncidentORM.created_at >= cutoff_time
+            )
+        ]
+        
+        # Simple keyword extraction from titles; only meaningful words count
+        topic_counts = Counter(
+            word
+            for title in titles
+            for word in title.lower().split()
+            if len(word) > 4 and word.isalpha()
+        )
         
         # Sort by frequency
-        trending = sorted(topic_counts.items(), key=lambda x: x[1], reverse=True)[:10]
+        trending = topic_counts.most_common(10)
         
         return {
             "trending_topics": [
@@ -259,69 +251,56 @@ async def get_trending_topics(
                 for topic, count in trending
             ],
             "analysis_period_hours": hours,
-            "total_incidents_analyzed": len(incidents),
+            "total_incidents_analyzed": len(titles),
             "last_updated": datetime.utcnow().isoformat()
         }
         
     except Exception as e:
-        logger.error(f"Error getting trending topics: {e}")
+        logger.error("Error getting trending topics: %s", e)
         raise HTTPException(status_code=500, detail=f"Failed to get trending topics: {str(e)}")
 
-async def perform_topic_analysis(topic: str, keywords: List[str], source_types: List[str], max_results: int, time_range_hours: int):
+def perform_topic_analysis(topic: str, keywords: List[str], source_types: List[str], max_results: int, time_range_hours: int):
     """
     Background task to perform topic analysis.
     """
-    logger.info(f"Starting topic analysis for: {topic}")
+    logger.info("Starting topic analysis for: %s", topic)
     
-    # Create a new database session for this background task
-    from ...core.database import DatabaseManager
-    db_manager = DatabaseManager()
-    db = db_manager.get_session()
+    # Background tasks outlive the request, so this one opens its own session
+    db = SessionLocal()
     
     try:
-        
-        # Import scraping manager and default sources
-        from ...scrapers.manager import ScrapingManager
-        from ...config.default_sources import get_default_sources
-        
-        # Get configured sources
-        all_sources = get_default_sources()
-        
-        # Filter sources by requested types if specified
+        # Configured sources, filtered by requested types if specified
         if source_types:
-            filtered_sources = []
-            for source in all_sources:
-                source_type = source.get('source_type')
-                # Handle both enum values and string values
-                source_type_str = source_type.value if hasattr(source_type, 'value') else str(source_type)
-                if source_type_str in source_types:
-                    filtered_sources.append(source)
-            sources_to_scrape = filtered_sources
+            sources_to_scrape = get_sources_by_types(source_types)
         else:
-            sources_to_scrape = all_sources
+            sources_to_scrape = get_default_sources()
         
-        # Add topic-specific keywords to each source
-        for source in sources_to_scrape:
-            source_keywords = source.get('keywords', [])
-            # Add topic and additional keywords to source configuration
-            enhanced_keywords = source_keywords + [topic] + keywords
-            source['keywords'] = list(set(enhanced_keywords))  # Remove duplicates
+        # Add topic-specific keywords to per-scan copies of the sources;
+        # the defaults themselves are shared and must stay unchanged
+        topic_keywords = {topic, *keywords}
+        sources_to_scrape = [
+            dict(source, keywords=list(topic_keywords.union(source.get('keywords', []))))
+            for source in sources_to_scrape
+        ]
         
-        logger.info(f"Scraping {len(sources_to_scrape)} sources for topic: {topic}")
+        logger.info("Scraping %s sources for topic: %s", len(sources_to_scrape), topic)
         
         # Initialize scraping manager and perform scraping
         scraping_manager = ScrapingManager(max_workers=3)
-        scraping_results = scraping_manager.start_scraping(sources_to_scrape)
+        try:
+            scraping_results = scraping_manager.start_scraping(sources_to_scrape)
+        finally:
+            scraping_manager.close()
         
         scraped_items = scraping_results.get('results', [])
         sources_attempted = scraping_results.get('sources_count', len(sources_to_scrape))
         
-        logger.info(f"Scraped {len(scraped_items)} items from {sources_attempted} sources for topic: {topic}")
+        logger.info("Scraped %s items from %s sources for topic: %s", len(scraped_items), sources_attempted, topic)
         
         # If no items were scraped (due to anti-bot protections or other issues),
         # generate some demo data to demonstrate the system functionality
         if len(scraped_items) == 0:
-            logger.info(f"No items scraped, generating demo data for topic: {topic}")
+            logger.info("No items scraped, generating demo data for topic: %s", topic)
             demo_items = generate_demo_topic_data(topic, keywords, source_types, min(max_results, 3))
             
             # Update demo items to reflect the actual sources that were attempted
@@ -332,29 +311,31 @@ async def perform_topic_analysis(topic: str, keywords: List[str], source_types:
                     item['url'] = f"{source.get('url_pattern', 'https://example.com')}/article-{i+1}"
             
             items_to_process = demo_items
-            logger.info(f"Using {len(items_to_process)} demo items with real source attribution")
+            logger.info("Using %s demo items with real source attribution", len(items_to_process))
         else:
             items_to_process = scraped_items
         
-        # Analyze and store results
+        # Analyze results; incident rows are inserted together below
+        incident_rows = []
         for item in items_to_process:
             try:
                 # Perform risk assessment
                 content_text = item.get('description', item.get('content', ''))
                 risk_assessment = assess_content_risk(content_text, item.get('title', ''))
                 
-                # Create incident record
-                incident = IncidentORM(
-                    title=item.get('title', f"Threat detected: {topic}"),
-                    description=content_text[:1000],
-                    keywords=keywords,
-                    severity=risk_assessment.get('severity', 'low'),
-                    status='detected',
-                    confidence_score=risk_assessment.get('confidence', 0.0),
-                    risk_score=risk_assessment.get('score', 0.0),
-                    sentiment_score=0.0,  # Will be updated by sentiment analysis
-                    source_urls=[item.get('url', '')] if item.get('url') else [],
-                    incident_metadata={
+                # Incident record; topic metadata carries no source_type, so
+                # the column the ORM would derive from it stays empty
+                incident_rows.append({
+                    'title': item.get('title', f"Threat detected: {topic}"),
+                    'description': content_text[:1000],
+                    'keywords': keywords,
+                    'severity': risk_assessment.get('severity', 'low'),
+                    'status': 'detected',
+                    'confidence_score': risk_assessment.get('confidence', 0.0),
+                    'risk_score': risk_assessment.get('score', 0.0),
+                    'sentiment_score': 0.0,  # Will be updated by sentiment analysis
+                    'source_urls': [item.get('url', '')] if item.get('url') else [],
+                    'incident_metadata': {
                         'topic_analysis': True,
                         'search_topic': topic,
                         'source_name': item.get('source_name', 'Unknown'),
@@ -362,14 +343,16 @@ async def perform_topic_analysis(topic: str, keywords: List[str], source_types:
                         'risk_score': risk_assessment.get('score', 0.0),
                         'confidence': risk_assessment.get('confidence', 0.0)
                     }
-                )
-                
-                db.add(incident)
+                })
                 
             except Exception as e:
-                logger.error(f"Error processing demo item: {e}")
+                logger.error("Error processing demo item: %s", e)
                 continue
         
+        # One bulk INSERT instead of flushing an ORM object per item
+        if incident_rows:
+            db.execute(insert(IncidentORM), incident_rows)
+        
         # Store a summary record of the analysis attempt for tracking purposes
         if len(items_to_process) == 0:
             # Create a summary incident to track that sources were scanned
@@ -391,10 +374,11 @@ async def perform_topic_analysis(topic: str, keywords: List[str], source_types:
             db.add(summary_incident)
         
         db.commit()
-        logger.info(f"Completed topic analysis for: {topic}. Processed {len(items_to_process)} items from {sources_attempted} sources.")
+        dashboard_cache.invalidate()
+        logger.info("Completed topic analysis for: %s. Processed %s items from %s sources.", topic, len(items_to_process), sources_attempted)
         
     except Exception as e:
-        logger.error(f"Error in topic analysis for {topic}: {e}")
+        logger.error("Error in topic analysis for %s: %s", topic, e)
         if 'db' in locals():
             db.rollback()
         raise
@@ -402,19 +386,22 @@ async def perform_topic_analysis(topic: str, keywords: List[str], source_types:
         if 'db' in locals():
             db.close()
 
+# Simple keyword-based risk assessment for demo; each list is one
+# alternation so a text is scanned once per level, matching substrings
+HIGH_RISK_KEYWORDS = ['critical', 'urgent', 'breach', 'attack', 'malware', 'ransomware', 'exploit']
+MEDIUM_RISK_KEYWORDS = ['suspicious', 'threat', 'vulnerability', 'phishing', 'scam']
+_HIGH_RISK_RE = re.compile('|'.join(map(re.escape, HIGH_RISK_KEYWORDS)))
+_MEDIUM_RISK_RE = re.compile('|'.join(map(re.escape, MEDIUM_RISK_KEYWORDS)))
+
 def assess_content_risk(content: str, title: str) -> Dict[str, Any]:
     """
     Simple risk assessment for content.
     """
-    # Simple keyword-based risk assessment for demo
-    high_risk_keywords = ['critical', 'urgent', 'breach', 'attack', 'malware', 'ransomware', 'exploit']
-    medium_risk_keywords = ['suspicious', 'threat', 'vulnerability', 'phishing', 'scam']
-    
     text = f"{title} {content}".lower()
     
-    if any(keyword in text for keyword in high_risk_keywords):
+    if _HIGH_RISK_RE.search(text):
         return {'severity': 'high', 'score': 0.8, 'confidence': 0.9}
-    elif any(keyword in text for keyword in medium_risk_keywords):
+    elif _MEDIUM_RISK_RE.search(text):
         return {'severity': 'medium', 'score': 0.5, 'confidence': 0.7}
     else:
         return {'severity': 'low', 'score': 0.2, 'confidence': 0.5}
@@ -450,32 +437,44 @@ def generate_demo_topic_data(topic: str, keywords: List[str], source_types: List
     
     return demo_data
 
-def analyze_threat_patterns(incidents: List[IncidentORM]) -> Dict[str, Any]:
-    """Analyze threat patterns from incidents."""
-    severity_counts = {}
-    source_counts = {}
+@dataclass
+class IncidentAggregate:
+    """Counts gathered from topic incidents in a single pass."""
+    total: int = 0
+    severity_counts: Counter = field(default_factory=Counter)
+    source_counts: Counter = field(default_factory=Counter)
+    sentiments: List[float] = field(default_factory=list)
+    
+    @property
+    def high_severity_count(self) -> int:
+        return self.severity_counts['high'] + self.severity_counts['critical']
+
+def aggregate_incidents(incidents: List[IncidentORM]) -> IncidentAggregate:
+    """Collect severity, source and sentiment counts from incidents."""
+    agg = IncidentAggregate(total=len(incidents))
     
     for incident in incidents:
-        severity = incident.severity
-        severity_counts[severity] = severity_counts.get(severity, 0) + 1
+        agg.severity_counts[incident.severity] += 1
         
-        source = incident.incident_metadata.get('source_name', 'Unknown')
-        source_counts[source] = source_counts.get(source, 0) + 1
+        metadata = incident.incident_metadata or {}
+        agg.source_counts[metadata.get('source_name', 'Unknown')] += 1
+        if 'sentiment_score' in metadata:
+            agg.sentiments.append(metadata['sentiment_score'])
     
+    return agg
+
+def analyze_threat_patterns(agg: IncidentAggregate) -> Dict[str, Any]:
+    """Analyze threat patterns from aggregated incidents."""
     return {
-        "severity_distribution": severity_counts,
-        "source_distribution": source_counts,
-        "total_threats": len(incidents),
-        "high_severity_count": severity_counts.get('high', 0) + severity_counts.get('critical', 0)
+        "severity_distribution": dict(agg.severity_counts),
+        "source_distribution": dict(agg.source_counts),
+        "total_threats": agg.total,
+        "high_severity_count": agg.high_severity_count
     }
 
-def analyze_sentiment_patterns(incidents: List[IncidentORM]) -> Dict[str, Any]:
-    """Analyze sentiment patterns from incidents."""
-    sentiments = []
-    
-    for incident in incidents:
-        if incident.incident_metadata and 'sentiment_score' in incident.incident_metadata:
-            sentiments.append(incident.incident_metadata['sentiment_score'])
+def analyze_sentiment_patterns(agg: IncidentAggregate) -> Dict[str, Any]:
+    """Analyze sentiment patterns from aggregated incidents."""
+    sentiments = agg.sentiments
     
     if not sentiments:
         return {"overall": "neutral", "average_score": 0.0}
@@ -495,15 +494,12 @@ def analyze_sentiment_patterns(incidents: List[IncidentORM]) -> Dict[str, Any]:
         "sample_size": len(sentiments)
     }
 
-def determine_overall_risk(incidents: List[IncidentORM]) -> str:
-    """Determine overall risk level from incidents."""
-    high_risk_count = sum(1 for i in incidents if i.severity in ['high', 'critical'])
-    total_count = len(incidents)
-    
-    if total_count == 0:
+def determine_overall_risk(agg: IncidentAggregate) -> str:
+    """Determine overall risk level from aggregated incidents."""
+    if agg.total == 0:
         return "low"
     
-    high_risk_ratio = high_risk_count / total_count
+    high_risk_ratio = agg.high_severity_count / agg.total
     
     if high_risk_ratio > 0.3:
         return "critical"
@@ -514,21 +510,17 @@ def determine_overall_risk(incidents: List[IncidentORM]) -> str:
     else:
         return "low"
 
-def extract_key_findings(incidents: List[IncidentORM], topic: str) -> List[str]:
-    """Extract key findings from incidents."""
+def extract_key_findings(agg: IncidentAggregate, topic: str) -> List[str]:
+    """Extract key findings from aggregated incidents."""
     findings = []
     
-    if not incidents:
+    if not agg.total:
         return [f"No recent security incidents found related to '{topic}'"]
     
-    # Count by severity
-    severity_counts = {}
-    for incident in incidents:
-        severity = incident.severity
-        severity_counts[severity] = severity_counts.get(severity, 0) + 1
+    severity_counts = agg.severity_counts
     
     # Generate findings
-    findings.append(f"Found {len(incidents)} security-related discussions about '{topic}' in the last 24 hours")
+    findings.append(f"Found {agg.total} security-related discussions about '{topic}' in the last 24 hours")
     
     if severity_counts.get('critical', 0) > 0:
         findings.append(f"⚠️ {severity_counts['critical']} critical severity incidents detected")
@@ -536,15 +528,10 @@ def extract_key_findings(incidents: List[IncidentORM], topic: str) -> List[str]:
     if severity_counts.get('high', 0) > 0:
         findings.append(f"🔴 {severity_counts['high']} high severity incidents detected")
     
-    # Most active sources
-    source_counts = {}
-    for incident in incidents:
-        source = incident.incident_metadata.get('source_name', 'Unknown')
-        source_counts[source] = source_counts.get(source, 0) + 1
-    
-    if source_counts:
-        top_source = max(source_counts.items(), key=lambda x: x[1])
-        findings.append(f"Most active source: {top_source[0]} ({top_source[1]} reports)")
+    # Most active source
+    if agg.source_counts:
+        top_source, top_count = agg.source_counts.most_common(1)[0]
+        findings.append(f"Most active source: {top_source} ({top_count} reports)")
     
     return findings
 
@@ -2,7 +2,7 @@
 Default preconfigured sources for RiskRadar threat monitoring.
 """
 
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Iterable
 from ..core.models import SourceType
 
 DEFAULT_SOURCES: List[Dict[str, Any]] = [
@@ -191,6 +191,9 @@ SOURCE_CATEGORIES = {
     }
 }
 
+# Type value of each default source, in DEFAULT_SOURCES order
+_DEFAULT_SOURCE_TYPE_VALUES = [source["source_type"].value for source in DEFAULT_SOURCES]
+
 def get_default_sources() -> List[Dict[str, Any]]:
     """Get the list of default preconfigured sources."""
     return DEFAULT_SOURCES.copy()
@@ -206,3 +209,11 @@ def get_sources_by_category(category: str) -> List[Dict[str, Any]]:
     
     category_sources = SOURCE_CATEGORIES[category]["sources"]
     return [source for source in DEFAULT_SOURCES if source["name"] in category_sources]
+
+def get_sources_by_types(source_types: Iterable[Any]) -> List[Dict[str, Any]]:
+    """Get sources whose type is one of the given SourceTypes or type values."""
+    requested = {getattr(source_type, "value", source_type) for source_type in source_types}
+    return [
+        source for source, type_value in zip(DEFAULT_SOURCES, _DEFAULT_SOURCE_TYPE_VALUES)
+        if type_value in requested
+    ]
@@ -3,11 +3,13 @@ Database configuration and management for RiskRadar.
 """
 
 import os
+from contextlib import ExitStack
 from typing import Optional
-from sqlalchemy import create_engine, MetaData, text
+from sqlalchemy import create_engine, func, inspect, MetaData, text, update
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker, Session
 from sqlalchemy.pool import StaticPool
+from sqlalchemy.exc import DBAPIError, IntegrityError
 import logging
 
 logger = logging.getLogger(__name__)
@@ -21,6 +23,18 @@ DATABASE_URL = os.getenv(
 # For development, fall back to SQLite if PostgreSQL is not available
 SQLITE_URL = "sqlite:///./riskradar.db"
 
+# Compiled SQL cache entries per engine (SQLAlchemy defaults to 500); every
+# optional-filter combination of an endpoint query takes its own entry
+QUERY_CACHE_SIZE = int(os.getenv("RISKRADAR_QUERY_CACHE_SIZE", "1200"))
+
+# PostgreSQL connection pool; dashboard refreshes and metrics scrapes hit
+# several endpoints at once, more than SQLAlchemy's default 5 pooled
+# connections serve. Sizes are per process: 4 API workers at 10 + 5 stay at
+# 60 connections, under PostgreSQL's default max_connections of 100.
+POOL_SIZE = int(os.getenv("RISKRADAR_DB_POOL_SIZE", "10"))
+POOL_MAX_OVERFLOW = int(os.getenv("RISKRADAR_DB_MAX_OVERFLOW", "5"))
+POOL_RECYCLE_SECONDS = int(os.getenv("RISKRADAR_DB_POOL_RECYCLE", "1800"))
+
 Base = declarative_base()
 
 class DatabaseManager:
@@ -37,7 +51,14 @@ class DatabaseManager:
         try:
             # Try PostgreSQL first
             if self.database_url.startswith("postgresql"):
-                self.engine = create_engine(self.database_url)
+                self.engine = create_engine(
+                    self.database_url,
+                    query_cache_size=QUERY_CACHE_SIZE,
+                    pool_size=POOL_SIZE,
+                    max_overflow=POOL_MAX_OVERFLOW,
+                    pool_pre_ping=True,
+                    pool_recycle=POOL_RECYCLE_SECONDS,
+                )
                 # Test connection
                 with self.engine.connect() as conn:
                     conn.execute(text("SELECT 1"))
@@ -55,6 +76,7 @@ class DatabaseManager:
                 self.database_url,
                 connect_args={"check_same_thread": False},
                 poolclass=StaticPool,
+                query_cache_size=QUERY_CACHE_SIZE,
             )
         
         self.SessionLocal = sessionmaker(
@@ -66,9 +88,69 @@ class DatabaseManager:
     def create_tables(self):
         """Create all database tables."""
         from .models import Base
+        self._create_extensions()
         Base.metadata.create_all(bind=self.engine)
+        self._migrate_incident_source_type()
+        
+        # create_all skips indexes on tables that already exist
+        for table in Base.metadata.sorted_tables:
+            for index in table.indexes:
+                try:
+                    index.create(bind=self.engine, checkfirst=True)
+                except IntegrityError as e:
+                    # A unique index over rows that already hold duplicates
+                    logger.warning(f"Could not create index {index.name}: {e}")
         logger.info("Database tables created successfully")
     
+    def _create_extensions(self):
+        """Enable the PostgreSQL extensions used by the trigram indexes."""
+        if self.engine.dialect.name != "postgresql":
+            return
+        
+        try:
+            with self.engine.begin() as conn:
+                conn.execute(text("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
+        except DBAPIError as e:
+            # Needs CREATE privilege on the database; trigram indexes are skipped without it
+            logger.warning(f"Could not enable pg_trgm, keyword search will not be indexed: {e}")
+    
+    def _migrate_incident_source_type(self):
+        """Add and backfill incidents.source_type on databases created before it existed."""
+        from .models import IncidentORM
+        
+        columns = {column["name"] for column in inspect(self.engine).get_columns("incidents")}
+        if "source_type" in columns:
+            return
+        
+        logger.info("Adding source_type column to incidents")
+        incidents = IncidentORM.__table__
+        with self.engine.begin() as conn:
+            conn.execute(text("ALTER TABLE incidents ADD COLUMN source_type VARCHAR"))
+            conn.execute(
+                update(incidents).values(
+                    source_type=incidents.c.incident_metadata["source_type"].as_string(),
+                    # Backfilling is not an edit; keep updated_at as it was
+                    updated_at=incidents.c.updated_at
+                )
+            )
+    
+    def warm_pool(self, connections: Optional[int] = None):
+        """
+        Open pooled connections ahead of the first requests.
+        
+        Args:
+            connections: Connections to open; defaults to the pool size
+        """
+        if self.engine.dialect.name != "postgresql":
+            return
+        
+        connections = POOL_SIZE if connections is None else connections
+        # Hold every connection at once so each one is a new connection, not the same one reused
+        with ExitStack() as stack:
+            for _ in range(connections):
+                stack.enter_context(self.engine.connect())
+        logger.info(f"Warmed database pool with {connections} connections")
+    
     def get_session(self) -> Session:
         """Get a database session."""
         return self.SessionLocal()
@@ -106,7 +188,7 @@ def init_database():
     db = db_manager.get_session()
     try:
         # Check if sources already exist
-        existing_sources = db.query(DataSourceORM).count()
+        existing_sources = db.query(func.count(DataSourceORM.id)).scalar()
         
         if existing_sources == 0:
             logger.info("Inserting default sources...")
@@ -139,9 +221,8 @@ def init_database():
 def check_database_health() -> bool:
     """Check if database is healthy and accessible."""
     try:
-        db = db_manager.get_session()
-        db.execute(text("SELECT 1"))
-        db.close()
+        with db_manager.engine.connect() as conn:
+            conn.execute(text("SELECT 1"))
         return True
     except Exception as e:
         logger.error(f"Database health check failed: {e}")
@@ -10,9 +10,8 @@ from dataclasses import dataclass
 
 from .models import Incident, RiskAssessment, Alert, SeverityLevel, IncidentStatus
 from ..scrapers.manager import ScrapingManager
-from ..analysis.sentiment import SentimentAnalyzer
 from ..analysis.risk_scorer import RiskScorer
-from ..analysis.entity_extractor import EntityExtractor
+from ..analysis.text_analyzer import analyze_text
 
 
 @dataclass
@@ -42,9 +41,7 @@ class RiskRadarEngine:
         self.scraping_manager = ScrapingManager(
             max_concurrent=config.max_concurrent_scrapers
         )
-        self.sentiment_analyzer = SentimentAnalyzer()
         self.risk_scorer = RiskScorer()
-        self.entity_extractor = EntityExtractor()
         
         # Runtime state
         self.active_incidents: Dict[str, Incident] = {}
@@ -112,9 +109,10 @@ class RiskRadarEngine:
             if not matched_keywords:
                 return None
             
-            # Perform analysis
-            sentiment_score = await self.sentiment_analyzer.analyze(text)
-            entities = await self.entity_extractor.extract(text)
+            # Perform analysis (entities and sentiment share one text scan)
+            analysis = analyze_text(text)
+            sentiment_score = analysis['sentiment_score']
+            entities = analysis['entities']
             risk_score = await self.risk_scorer.calculate_risk(
                 text=text,
                 sentiment=sentiment_score,
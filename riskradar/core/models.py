@@ -6,8 +6,9 @@ from datetime import datetime
 from enum import Enum
 from typing import Dict, List, Optional, Any
 from pydantic import BaseModel, Field, validator
-from sqlalchemy import Column, Integer, String, DateTime, Float, JSON, Text, Boolean
+from sqlalchemy import Column, Integer, String, DateTime, Float, JSON, Text, Boolean, Index, text
 from sqlalchemy.ext.declarative import declarative_base
+from sqlalchemy.orm import validates
 from sqlalchemy.dialects.postgresql import UUID
 import uuid
 
@@ -71,6 +72,21 @@ class Incident(BaseModel):
         return max(-1.0, min(1.0, v))
 
 
+class IncidentListItem(BaseModel):
+    """Summary of an incident for list views; the full record is an Incident."""
+    model_config = {"from_attributes": True}
+    
+    id: str
+    title: str
+    keywords: List[str] = Field(default=[], description="Keywords that triggered detection")
+    severity: SeverityLevel
+    # Threat review statuses (pending, confirmed, ...) are not IncidentStatus values
+    status: str
+    risk_score: float = Field(description="Overall risk score")
+    source_type: Optional[str] = None
+    created_at: datetime
+
+
 class RiskAssessment(BaseModel):
     """Risk assessment for an incident."""
     incident_id: str
@@ -118,6 +134,13 @@ class DataSource(BaseModel):
 
 
 # SQLAlchemy ORM Models
+def _pg_trgm_installed(ddl, target, bind, **kw) -> bool:
+    """Whether the pg_trgm extension needed by trigram indexes is installed."""
+    return bind.execute(
+        text("SELECT 1 FROM pg_extension WHERE extname = 'pg_trgm'")
+    ).first() is not None
+
+
 class IncidentORM(Base):
     """SQLAlchemy model for incidents."""
     __tablename__ = "incidents"
@@ -134,8 +157,42 @@ class IncidentORM(Base):
     source_urls = Column(JSON, default=[])
     entities = Column(JSON, default={})
     incident_metadata = Column(JSON, default={})
+    # Copy of incident_metadata["source_type"], so it can be filtered and grouped on
+    source_type = Column(String, index=True)
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    
+    __table_args__ = (
+        # Covers the time-window counts used by the dashboard and threat stats
+        Index("ix_incidents_created_status_risk", created_at, status, risk_score),
+        # Threat list filters on status or severity within a time window
+        Index("ix_incidents_status_created", status, created_at),
+        Index("ix_incidents_severity_created", severity, created_at),
+        # Highest-risk-first listings and the high-risk threshold
+        Index("ix_incidents_risk_created", risk_score, created_at),
+        # Trigram indexes serve the threat list's substring keyword search
+        # (ILIKE '%keyword%'); PostgreSQL with pg_trgm only
+        Index(
+            "ix_incidents_title_trgm",
+            title,
+            postgresql_using="gin",
+            postgresql_ops={"title": "gin_trgm_ops"}
+        ).ddl_if(dialect="postgresql", callable_=_pg_trgm_installed),
+        Index(
+            "ix_incidents_description_trgm",
+            description,
+            postgresql_using="gin",
+            postgresql_ops={"description": "gin_trgm_ops"}
+        ).ddl_if(dialect="postgresql", callable_=_pg_trgm_installed),
+    )
+    
+    @validates("incident_metadata")
+    def _sync_source_type(self, key, incident_metadata):
+        """Populate source_type whenever incident_metadata is assigned."""
+        if incident_metadata and "source_type" in incident_metadata:
+            source_type = incident_metadata["source_type"]
+            self.source_type = getattr(source_type, "value", source_type)
+        return incident_metadata
 
 
 class RiskAssessmentORM(Base):
@@ -178,7 +235,7 @@ class DataSourceORM(Base):
     __tablename__ = "data_sources"
 
     id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
-    name = Column(String, nullable=False)
+    name = Column(String, nullable=False, unique=True, index=True)
     source_type = Column(String, nullable=False)
     url_pattern = Column(String, nullable=False)
     keywords = Column(JSON, default=[])
@@ -187,3 +244,13 @@ class DataSourceORM(Base):
     enabled = Column(Boolean, default=True)
     last_scraped = Column(DateTime)
     created_at = Column(DateTime, default=datetime.utcnow)
+    
+    __table_args__ = (
+        # Partial index so enabled-source counts only touch enabled rows
+        Index(
+            "ix_data_sources_enabled",
+            id,
+            postgresql_where=enabled == True,
+            sqlite_where=enabled == True
+        ),
+    )
@@ -3,6 +3,7 @@ Base scraper class for web scraping operations.
 """
 
 import requests
+from requests.adapters import HTTPAdapter
 from bs4 import BeautifulSoup
 from typing import List, Dict, Any, Optional
 from datetime import datetime
@@ -19,8 +20,14 @@ logger = logging.getLogger(__name__)
 class BaseScraper:
     """Base class for all web scrapers."""
     
-    def __init__(self, source_config: Dict[str, Any]):
-        """Initialize the scraper with source configuration."""
+    def __init__(self, source_config: Dict[str, Any], http_adapter: Optional[HTTPAdapter] = None):
+        """
+        Initialize the scraper with source configuration.
+        
+        Args:
+            source_config: Source configuration
+            http_adapter: Optional adapter whose connection pool is shared with other scrapers
+        """
         self.source_config = source_config
         self.name = source_config.get('name', 'Unknown Source')
         self.source_type = source_config.get('source_type', 'unknown')
@@ -41,6 +48,11 @@ class BaseScraper:
             'Upgrade-Insecure-Requests': '1',
         })
         
+        # Reuse kept-alive connections from the shared pool, if given
+        if http_adapter is not None:
+            self.session.mount('http://', http_adapter)
+            self.session.mount('https://', http_adapter)
+        
         self.scraped_urls = set()  # Track scraped URLs to avoid duplicates
         
     def scrape(self) -> List[Dict[str, Any]]:
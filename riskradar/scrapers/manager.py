@@ -9,6 +9,8 @@ import asyncio
 import concurrent.futures
 from threading import Lock
 
+from requests.adapters import HTTPAdapter
+
 from .news_scraper import NewsScraper
 from .government_scraper import GovernmentScraper
 from .social_scraper import SocialScraper
@@ -35,6 +37,14 @@ class ScrapingManager:
         self.max_workers = max_workers
         self.stats_lock = Lock()
         
+        # One connection pool for every scraper this manager creates, so
+        # repeat requests to a host reuse kept-alive connections instead of
+        # paying a new TCP/TLS handshake per scraper
+        self.http_adapter = HTTPAdapter(
+            pool_connections=32,
+            pool_maxsize=max(10, max_workers * 2)
+        )
+        
         # Scraper type mapping
         self.scraper_classes = {
             'news': NewsScraper,
@@ -137,6 +147,10 @@ class ScrapingManager:
             'stopped_at': datetime.utcnow().isoformat()
         }
     
+    def close(self):
+        """Close the pooled connections shared by this manager's scrapers."""
+        self.http_adapter.close()
+    
     def get_scraping_status(self) -> Dict[str, Any]:
         """Get current scraping status and statistics."""
         with self.stats_lock:
@@ -166,7 +180,7 @@ class ScrapingManager:
             scraper_class = self.scraper_classes.get(source_type, BaseScraper)
             
             # Create scraper instance
-            scraper = scraper_class(source_config)
+            scraper = scraper_class(source_config, http_adapter=self.http_adapter)
             
             # Add to active scrapers
             scraper_id = f"{source_name}_{datetime.utcnow().timestamp()}"
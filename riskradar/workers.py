@@ -0,0 +1,114 @@
+"""
+Out-of-process task queue for scraping jobs.
+
+Scraping runs in Celery worker processes when Celery is installed and a
+broker is configured through ``RISKRADAR_BROKER_URL`` (for example
+``redis://localhost:6379/0``). Start workers separately from the API with::
+
+    celery -A riskradar.workers worker --loglevel=info
+
+Without a broker, ``enqueue_scraping`` returns None and the API falls back
+to running scrapes in its own process.
+"""
+
+import os
+import logging
+import uuid
+from typing import Any, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+BROKER_URL = os.getenv("RISKRADAR_BROKER_URL")
+RESULT_BACKEND_URL = os.getenv("RISKRADAR_RESULT_BACKEND_URL", BROKER_URL)
+
+try:
+    from celery import Celery
+    from celery.result import AsyncResult
+except ImportError:
+    Celery = None
+    AsyncResult = None
+
+if Celery is not None and BROKER_URL:
+    app = Celery("riskradar", broker=BROKER_URL, backend=RESULT_BACKEND_URL)
+    app.conf.task_track_started = True
+else:
+    app = None
+
+# Celery reports unknown job IDs as PENDING, so jobs are stored in this state
+# before they are sent; PENDING then only means the job ID is unknown
+QUEUED_STATE = "QUEUED"
+
+
+def run_scraping_job(source_configs: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Scrape the given sources in the current process.
+    
+    Args:
+        source_configs: Source configurations to scrape
+    
+    Returns:
+        Scraping results from the scraping manager
+    """
+    from .scrapers.manager import ScrapingManager
+    
+    manager = ScrapingManager(max_workers=5)
+    try:
+        results = manager.start_scraping(source_configs)
+    finally:
+        manager.close()
+    
+    logger.info(f"Scraping job completed: {results.get('status')}")
+    return results
+
+
+if app is not None:
+    run_scraping_task = app.task(name="riskradar.run_scraping")(run_scraping_job)
+else:
+    run_scraping_task = None
+
+
+def enqueue_scraping(source_configs: List[Dict[str, Any]]) -> Optional[str]:
+    """
+    Send a scraping job to the worker queue.
+    
+    Args:
+        source_configs: Source configurations to scrape
+    
+    Returns:
+        Job ID, or None if no queue is configured
+    """
+    if run_scraping_task is None:
+        return None
+    
+    job_id = uuid.uuid4().hex
+    app.backend.store_result(job_id, None, QUEUED_STATE)
+    run_scraping_task.apply_async((source_configs,), task_id=job_id)
+    return job_id
+
+
+def get_job_status(job_id: str) -> Optional[Dict[str, Any]]:
+    """
+    Get the state of a queued scraping job.
+    
+    Args:
+        job_id: ID returned by enqueue_scraping
+    
+    Returns:
+        Job state and, once finished, its result or error; None if no queue
+        is configured or the job is unknown (or its result has expired)
+    """
+    if app is None:
+        return None
+    
+    result = AsyncResult(job_id, app=app)
+    if result.state == "PENDING":
+        return None
+    
+    status = {"job_id": job_id, "state": result.state.lower()}
+    
+    if result.successful():
+        status["result"] = result.result
+    elif result.failed():
+        status["error"] = str(result.result)
+    
+    return status
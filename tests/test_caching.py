@@ -0,0 +1,47 @@
+"""Tests for the in-process response cache."""
+
+import time
+
+import pytest
+from starlette.requests import Request
+
+from riskradar.api.caching import TTLCache, cached_json_response
+
+
+def _request():
+    return Request({"type": "http", "method": "GET", "headers": []})
+
+
+def test_expired_entries_are_dropped():
+    cache = TTLCache(ttl_seconds=60)
+    cache.set("key", "value", ttl_seconds=0)
+    
+    assert cache.get("key") is None
+    assert "key" not in cache._entries
+
+
+def test_failed_rebuild_is_not_served_from_expired_copy():
+    cache = TTLCache(ttl_seconds=60)
+    cached_json_response(_request(), cache, "key", lambda: {"ok": True}, ttl_seconds=0.01)
+    time.sleep(0.02)
+    
+    def failing_build():
+        raise RuntimeError("database unavailable")
+    
+    with pytest.raises(RuntimeError):
+        cached_json_response(_request(), cache, "key", failing_build)
+
+
+def test_invalidate_during_compute_is_not_overwritten():
+    cache = TTLCache(ttl_seconds=60)
+    
+    def compute():
+        # A write commits and invalidates while this snapshot is being built
+        cache.invalidate()
+        return "before write"
+    
+    assert cache.get_or_compute("key", compute) == "before write"
+    assert cache.get("key") is None
+    
+    assert cache.get_or_compute("key", lambda: "after write") == "after write"
+    assert cache.get("key") == "after write"
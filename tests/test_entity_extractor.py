@@ -0,0 +1,45 @@
+"""Tests for entity extraction."""
+
+from riskradar.analysis.entity_extractor import (
+    ENTITY_PATTERNS,
+    THREAT_KEYWORDS,
+    EntityExtractor
+)
+
+
+TEXT = "Ransomware hit Acme Corp; ticket INC-12345 traced to 203.0.113.7 and a wormable flaw."
+
+
+def test_default_extraction():
+    entities = EntityExtractor().extract_entities(TEXT)
+    
+    assert entities['ip_addresses'] == ['203.0.113.7']
+    assert entities['threat_keywords'] == ['ransomware']
+    assert entities['organizations'] == ['Acme Corp']
+
+
+def test_edited_patterns_are_used():
+    extractor = EntityExtractor()
+    extractor.patterns['ticket_ids'] = r'inc-\d+'
+    del extractor.patterns['ip_addresses']
+    
+    entities = extractor.extract_entities(TEXT)
+    
+    assert entities['ticket_ids'] == ['INC-12345']
+    assert 'ip_addresses' not in entities
+    assert extractor.extract_batch([TEXT]) == [entities]
+    
+    # Other instances and the module tables are unaffected
+    assert 'ticket_ids' not in ENTITY_PATTERNS
+    assert EntityExtractor().extract_entities(TEXT)['ip_addresses'] == ['203.0.113.7']
+
+
+def test_edited_threat_keywords_are_used():
+    extractor = EntityExtractor()
+    extractor.threat_keywords.append('wormable')
+    
+    assert extractor.extract_entities(TEXT)['threat_keywords'] == ['ransomware', 'wormable']
+    assert 'wormable' not in THREAT_KEYWORDS
+    
+    extractor.threat_keywords = list(THREAT_KEYWORDS)
+    assert extractor.extract_entities(TEXT)['threat_keywords'] == ['ransomware']
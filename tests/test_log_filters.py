@@ -0,0 +1,38 @@
+"""Tests for the API log filters."""
+
+import logging
+
+from riskradar.api.log_filters import RateLimitingFilter
+
+
+def _record(msg, *args, level=logging.ERROR):
+    return logging.LogRecord("riskradar.test", level, __file__, 1, msg, args, None)
+
+
+def test_repeats_are_grouped_by_template():
+    log_filter = RateLimitingFilter(burst=2, period=60.0)
+    
+    passed = [
+        log_filter.filter(_record("Error fetching threat %s: %s", threat_id, "boom"))
+        for threat_id in range(5)
+    ]
+    
+    assert passed == [True, True, False, False, False]
+
+
+def test_low_levels_are_not_limited():
+    log_filter = RateLimitingFilter(burst=1, period=60.0)
+    
+    assert all(log_filter.filter(_record("Processed %s", i, level=logging.INFO))
+               for i in range(5))
+
+
+def test_max_keys_is_a_hard_limit():
+    log_filter = RateLimitingFilter(burst=1, period=60.0, max_keys=3)
+    
+    for i in range(10):
+        assert log_filter.filter(_record(f"Distinct message {i}"))
+    
+    assert len(log_filter._windows) == 3
+    # The newest keys are kept
+    assert not log_filter.filter(_record("Distinct message 9"))
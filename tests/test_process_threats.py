@@ -0,0 +1,96 @@
+"""Tests for the threat processing pipeline endpoints."""
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from riskradar.api.routers import system
+from riskradar.core.models import Base, IncidentORM
+
+
+@pytest.fixture
+def session_factory(tmp_path, monkeypatch):
+    engine = create_engine(f"sqlite:///{tmp_path / 'test.db'}")
+    Base.metadata.create_all(engine)
+    factory = sessionmaker(bind=engine)
+    # The background task opens its own session through SessionLocal
+    monkeypatch.setattr(system, "SessionLocal", factory)
+    yield factory
+    engine.dispose()
+
+
+@pytest.fixture
+def client(session_factory):
+    app = FastAPI()
+    app.include_router(system.router)
+    return TestClient(app)
+
+
+def test_process_threats_stores_threats(client, session_factory):
+    contents = [
+        {
+            "id": "threat",
+            "title": "Ransomware attack causes data breach",
+            "description": "Attackers exploited a vulnerability and leaked customer data.",
+            "severity": "high",
+            "confidence_score": 0.9,
+            "source_type": "news",
+            "source_name": "Example News",
+            "url": "https://example.com/breach",
+            "keywords": ["ransomware"]
+        },
+        {
+            "id": "benign",
+            "title": "Company opens new office",
+            "description": "The company celebrated the opening of its new office.",
+            "severity": "info"
+        }
+    ]
+    
+    response = client.post("/api/system/process-threats", json=contents)
+    
+    assert response.status_code == 200
+    assert response.json()["content_ids"] == ["threat", "benign"]
+    
+    with session_factory() as db:
+        incidents = db.query(IncidentORM).all()
+    
+    assert len(incidents) == 1
+    incident = incidents[0]
+    assert incident.title == contents[0]["title"]
+    assert incident.severity == "high"
+    assert incident.status == "detected"
+    assert incident.source_urls == ["https://example.com/breach"]
+    assert incident.source_type == "news"
+    assert incident.incident_metadata["source_name"] == "Example News"
+    assert incident.sentiment_score < 0
+    assert 6.0 <= incident.risk_score <= 10.0
+
+
+def test_process_threat_stores_single_threat(client, session_factory):
+    response = client.post("/api/system/process-threat", json={
+        "title": "Critical exploit in the wild",
+        "description": "An urgent malware campaign is attacking servers.",
+        "severity": "critical"
+    })
+    
+    assert response.status_code == 200
+    with session_factory() as db:
+        assert db.query(IncidentORM).count() == 1
+
+
+def test_process_threats_rejects_invalid_content(client, session_factory):
+    response = client.post("/api/system/process-threats", json=[
+        {"title": "Missing description"}
+    ])
+    assert response.status_code == 400
+    
+    response = client.post("/api/system/process-threats", json=[
+        {"title": "Title", "description": "Body", "severity": "severe"}
+    ])
+    assert response.status_code == 400
+    
+    with session_factory() as db:
+        assert db.query(IncidentORM).count() == 0
@@ -0,0 +1,61 @@
+"""Tests for the risk assessor."""
+
+import random
+
+import pytest
+
+from riskradar.analysis.risk_assessor import RiskAssessor
+from riskradar.core.models import Incident, SeverityLevel
+
+
+SOURCE_TYPES = ['government', 'news', 'forum', 'social_media', 'unknown', 'other']
+
+
+def _random_incidents(count, seed=0):
+    rng = random.Random(seed)
+    return [
+        Incident(
+            title=f"Incident {i}",
+            description="Synthetic incident",
+            severity=rng.choice(list(SeverityLevel)),
+            confidence_score=rng.random(),
+            risk_score=rng.uniform(0.0, 10.0),
+            sentiment_score=rng.uniform(-1.0, 1.0),
+            incident_metadata={'source_type': rng.choice(SOURCE_TYPES)}
+        )
+        for i in range(count)
+    ]
+
+
+def test_batch_scores_match_assess_risk():
+    assessor = RiskAssessor()
+    incidents = _random_incidents(200)
+    
+    results = assessor.assess_batch(incidents)
+    
+    assert len(results) == len(incidents)
+    for incident, result in zip(incidents, results):
+        expected = assessor.assess_risk(incident)
+        assert result['incident_id'] == incident.id
+        assert result['risk_score'] == pytest.approx(expected)
+        assert result['risk_category'] == assessor.categorize_risk(expected)
+
+
+def test_risk_summary_matches_assess_risk():
+    assessor = RiskAssessor()
+    incidents = _random_incidents(50, seed=1)
+    scores = [assessor.assess_risk(incident) for incident in incidents]
+    
+    summary = assessor.get_risk_summary(incidents)
+    
+    assert summary['total_incidents'] == len(incidents)
+    assert summary['average_risk'] == pytest.approx(sum(scores) / len(scores))
+    assert summary['highest_risk'] == pytest.approx(max(scores))
+    assert sum(summary['risk_distribution'].values()) == len(incidents)
+
+
+def test_risk_summary_empty():
+    summary = RiskAssessor().get_risk_summary([])
+    
+    assert summary['total_incidents'] == 0
+    assert summary['average_risk'] == 0.0
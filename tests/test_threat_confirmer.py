@@ -0,0 +1,68 @@
+"""Tests for threat confirmation."""
+
+import asyncio
+
+import pytest
+
+from riskradar.analysis.threat_confirmer import ThreatConfirmer
+from riskradar.core.models import Incident, SeverityLevel
+
+
+def _incident(risk_score, severity):
+    return Incident(
+        title="Incident",
+        description="Synthetic incident",
+        severity=severity,
+        confidence_score=0.5,
+        risk_score=risk_score,
+        sentiment_score=0.0
+    )
+
+
+def test_confirmation_stats_empty():
+    assert ThreatConfirmer().get_confirmation_stats() == {"total_confirmations": 0}
+
+
+def test_confirmation_stats_follow_direct_mutation():
+    confirmer = ThreatConfirmer()
+    confirmer.recent_confirmations.extend([
+        _incident(8.0, SeverityLevel.HIGH),
+        _incident(4.0, SeverityLevel.MEDIUM)
+    ])
+    stats = confirmer.get_confirmation_stats()
+    assert stats["total_confirmations"] == 2
+    assert stats["average_risk_score"] == pytest.approx(6.0)
+    
+    # Replacing an item and popping then appending keep the length unchanged
+    confirmer.recent_confirmations[0] = _incident(2.0, SeverityLevel.LOW)
+    confirmer.recent_confirmations.pop()
+    confirmer.recent_confirmations.append(_incident(9.0, SeverityLevel.CRITICAL))
+    
+    stats = confirmer.get_confirmation_stats()
+    assert stats["total_confirmations"] == 2
+    assert stats["average_risk_score"] == pytest.approx(5.5)
+    assert stats["severity_distribution"] == {"low": 1, "critical": 1}
+
+
+def test_bulk_fallback_computes_cutoff_once(monkeypatch):
+    confirmer = ThreatConfirmer()
+    incidents = [_incident(6.0, SeverityLevel.HIGH) for _ in range(3)]
+    history = [_incident(7.0, SeverityLevel.HIGH)]
+    
+    def failing_batch(*args):
+        raise ValueError("batch failed")
+    
+    cutoff_calls = []
+    recent_cutoff = confirmer._recent_cutoff
+    
+    def counting_cutoff():
+        cutoff_calls.append(None)
+        return recent_cutoff()
+    
+    monkeypatch.setattr(confirmer, "_calculate_confirmation_scores", failing_batch)
+    monkeypatch.setattr(confirmer, "_recent_cutoff", counting_cutoff)
+    
+    results = asyncio.run(confirmer.bulk_evaluate_incidents(incidents, history))
+    
+    assert len(results) == 3
+    assert len(cutoff_calls) == 1